@@ -1,14 +1,21 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse, FileResponse
-from typing import List, Dict, Any
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, FileResponse, Response
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import hashlib
 import os
 import shutil
+import stat
+import uuid
 from pathlib import Path
-import json
 import logging
 from datetime import datetime
+import aiofiles
+import orjson
 
-from ..database import db
+from ..database import db, DatabaseBusyError, BACKEND_DIR
+from ..models.document import DocumentRow
+from ..services.file_service import link_or_copy
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -16,9 +23,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
 # Define upload directory
-UPLOAD_DIR = Path(__file__).parent.parent.parent / "uploads"
+UPLOAD_DIR = BACKEND_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Upload limits
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# PDF files must carry this header within their first 1024 bytes
+PDF_SIGNATURE = b'%PDF-'
+
+# Bound concurrent per-file upload work to avoid flooding disk and database
+_upload_semaphore = asyncio.Semaphore(8)
+
 def get_database():
     """Dependency to get database instance"""
     return db
@@ -27,7 +44,7 @@ def get_database():
 async def upload_documents(
     files: List[UploadFile] = File(...),
     database = Depends(get_database)
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Upload multiple PDF documents
     
@@ -41,72 +58,119 @@ async def upload_documents(
     uploaded_documents = []
     errors = []
     
-    for file in files:
+    # Validate and write all files to disk concurrently
+    stored = []
+    results = await asyncio.gather(
+        *(_store_upload(file) for file in files),
+        return_exceptions=True
+    )
+    
+    for file, result in zip(files, results):
+        if isinstance(result, UploadRejected):
+            errors.append({
+                "filename": file.filename,
+                "error": str(result)
+            })
+        elif isinstance(result, BaseException):
+            logger.error(f"Error uploading file {file.filename}: {str(result)}")
+            errors.append({
+                "filename": file.filename,
+                "error": f"Upload failed: {str(result)}"
+            })
+        else:
+            upload_path, file_size, digest = result
+            stored.append((file.filename, upload_path, file_size, digest))
+    
+    # Drop files whose content is already stored, within this request or earlier
+    existing_documents = await asyncio.gather(
+        *(asyncio.to_thread(database.get_document_by_sha, digest) for *_, digest in stored)
+    )
+    unique_uploads = {}
+    duplicate_uploads = []
+    for entry, existing in zip(stored, existing_documents):
+        filename, upload_path, file_size, digest = entry
+        if existing is None and digest not in unique_uploads:
+            unique_uploads[digest] = entry
+            continue
+        upload_path.unlink(missing_ok=True)
+        duplicate_uploads.append((filename, file_size, digest, existing))
+        logger.info(f"Skipped duplicate upload {filename} ({digest})")
+    stored = list(unique_uploads.values())
+    
+    # Register all stored files with a single database write
+    doc_ids = []
+    if stored:
         try:
-            # Validate file type
-            if not file.filename.lower().endswith('.pdf'):
-                errors.append({
-                    "filename": file.filename,
-                    "error": "Only PDF files are allowed"
-                })
-                continue
-            
-            # Validate file size (50MB limit)
-            file_content = await file.read()
-            if len(file_content) > 50 * 1024 * 1024:  # 50MB
+            doc_ids = await asyncio.to_thread(
+                database.add_documents_bulk,
+                [
+                    {
+                        "original_filename": filename,
+                        "upload_path": str(upload_path),
+                        "sha256": digest
+                    }
+                    for filename, upload_path, _, digest in stored
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error registering uploaded files: {str(e)}")
+            for filename, upload_path, _, _ in stored:
+                upload_path.unlink(missing_ok=True)
                 errors.append({
-                    "filename": file.filename,
-                    "error": "File size exceeds 50MB limit"
+                    "filename": filename,
+                    "error": f"Upload failed: {str(e)}"
                 })
-                continue
-            
-            # Save file to uploads directory
-            upload_path = UPLOAD_DIR / file.filename
-            
-            # Handle duplicate filenames by appending timestamp
-            if upload_path.exists():
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                stem = Path(file.filename).stem
-                suffix = Path(file.filename).suffix
-                new_filename = f"{stem}_{timestamp}{suffix}"
-                upload_path = UPLOAD_DIR / new_filename
-                logger.info(f"Renamed duplicate file {file.filename} to {new_filename}")
-            
-            # Write file to uploads directory
-            with open(upload_path, "wb") as buffer:
-                buffer.write(file_content)
-            
-            # Add document to database
-            doc_id = database.add_document(
-                original_filename=file.filename,
-                upload_path=str(upload_path)
-            )
-            
-            # Copy raw file to output folder
-            document = database.get_document(doc_id)
-            if document:
-                raw_copy_path = Path(document['raw_copy_path'])
-                shutil.copy2(upload_path, raw_copy_path)
-                
-                # Create initial metadata.json
-                await _create_metadata_file(document)
-                
-                logger.info(f"Successfully uploaded and processed {file.filename} as {doc_id}")
-            
-            uploaded_documents.append({
-                "id": doc_id,
-                "filename": file.filename,
-                "size": len(file_content),
-                "upload_date": document['upload_date'].isoformat() if document else None,
-                "status": "uploaded"
+            stored = []
+    
+    # Populate output folders concurrently
+    finalized = await asyncio.gather(
+        *(
+            _finalize_upload(doc_id, upload_path, database)
+            for doc_id, (_, upload_path, _, _) in zip(doc_ids, stored)
+        ),
+        return_exceptions=True
+    )
+    
+    uploaded_by_digest = {}
+    for doc_id, (filename, _, file_size, digest), document in zip(doc_ids, stored, finalized):
+        if isinstance(document, BaseException):
+            logger.error(f"Error uploading file {filename}: {str(document)}")
+            errors.append({
+                "filename": filename,
+                "error": f"Upload failed: {str(document)}"
             })
-            
-        except Exception as e:
-            logger.error(f"Error uploading file {file.filename}: {str(e)}")
+            continue
+        
+        uploaded = {
+            "id": doc_id,
+            "filename": filename,
+            "size": file_size,
+            "upload_date": document.upload_date if document else None,
+            "status": "uploaded"
+        }
+        uploaded_documents.append(uploaded)
+        uploaded_by_digest[digest] = uploaded
+    
+    # Point duplicates at the document that already holds their content
+    duplicates = []
+    for filename, file_size, digest, existing in duplicate_uploads:
+        if existing is not None:
+            document = {
+                "id": existing.id,
+                "filename": existing.original_filename,
+                "size": file_size,
+                "upload_date": existing.upload_date,
+                "status": existing.status
+            }
+        elif digest in uploaded_by_digest:
+            document = uploaded_by_digest[digest]
+        else:
             errors.append({
-                "filename": file.filename,
-                "error": f"Upload failed: {str(e)}"
+                "filename": filename,
+                "error": "Upload failed: identical file in this request could not be stored"
             })
+            continue
+        duplicates.append({**document, "uploaded_as": filename})
     
     # Prepare response
     response_data = {
@@ -115,16 +179,127 @@ async def upload_documents(
         "error_count": len(errors)
     }
     
+    if duplicates:
+        response_data["duplicates"] = duplicates
+    
     if errors:
         response_data["errors"] = errors
     
-    status_code = 200 if uploaded_documents else 400
+    status_code = 200 if uploaded_documents or duplicates else 400
     
-    return JSONResponse(
+    return ORJSONResponse(
         content=response_data,
         status_code=status_code
     )
 
+class UploadRejected(Exception):
+    """Raised when an uploaded file fails validation"""
+
+async def _store_upload(file: UploadFile) -> Tuple[Path, int, str]:
+    """
+    Validate a single uploaded PDF and stream it to the uploads directory
+    
+    Args:
+        file: Uploaded PDF file
+        
+    Returns:
+        Tuple of (path the file was written to, file size in bytes, SHA-256 hex digest)
+        
+    Raises:
+        UploadRejected: If the file is not a PDF or exceeds the size limit
+    """
+    async with _upload_semaphore:
+        # Validate file type by extension, then by the PDF header in the first chunk
+        if file.filename[-4:].lower() != '.pdf':
+            raise UploadRejected("Only PDF files are allowed")
+        
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if PDF_SIGNATURE not in chunk[:1024]:
+            raise UploadRejected("Only PDF files are allowed")
+        
+        # Save file to uploads directory, exclusively created so concurrent uploads never
+        # overwrite each other. Duplicate filenames get a timestamp and a random suffix.
+        upload_path = UPLOAD_DIR / file.filename
+        while True:
+            try:
+                buffer = await aiofiles.open(upload_path, "xb")
+                break
+            except FileExistsError:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                stem = Path(file.filename).stem
+                suffix = Path(file.filename).suffix
+                new_filename = f"{stem}_{timestamp}_{uuid.uuid4().hex[:8]}{suffix}"
+                upload_path = UPLOAD_DIR / new_filename
+                logger.info(f"Renamed duplicate file {file.filename} to {new_filename}")
+        
+        # Stream file to uploads directory in chunks, enforcing the 50MB limit.
+        # The content hash is computed along the way for deduplication.
+        file_size = 0
+        hasher = hashlib.sha256()
+        try:
+            try:
+                while chunk:
+                    file_size += len(chunk)
+                    if file_size > MAX_UPLOAD_SIZE:
+                        break
+                    hasher.update(chunk)
+                    await buffer.write(chunk)
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            finally:
+                await buffer.close()
+        except BaseException:
+            # Don't leave a partial upload behind on read or write errors
+            upload_path.unlink(missing_ok=True)
+            raise
+        
+        if file_size > MAX_UPLOAD_SIZE:
+            upload_path.unlink(missing_ok=True)
+            raise UploadRejected("File size exceeds 50MB limit")
+        
+        return upload_path, file_size, hasher.hexdigest()
+
+async def _finalize_upload(
+    doc_id: str,
+    upload_path: Path,
+    database
+) -> Optional[DocumentRow]:
+    """
+    Populate the output folder of a newly registered document
+    
+    Args:
+        doc_id: Document ID
+        upload_path: Path to the uploaded file
+        database: Database instance
+        
+    Returns:
+        Document data from database
+    """
+    async with _upload_semaphore:
+        # Copy raw file to output folder
+        document = await asyncio.to_thread(database.get_document, doc_id)
+        if document:
+            raw_copy_path = Path(document.raw_copy_path)
+            await asyncio.to_thread(link_or_copy, upload_path, raw_copy_path)
+            
+            # Create initial metadata.json
+            await _create_metadata_file(document)
+            
+            logger.info(f"Successfully uploaded and processed {document.original_filename} as {doc_id}")
+        
+        return document
+
+def _format_list_entry(doc: DocumentRow) -> Dict[str, Any]:
+    """Format a database record for the document list response"""
+    return {
+        "id": doc.id,
+        "filename": doc.original_filename,
+        "upload_date": doc.upload_date,
+        "status": doc.status,
+        "last_modified": doc.last_modified,
+        "error_message": doc.error_message,
+        "has_extracted_info": doc.has_extracted_info
+    }
+
 @router.get("/")
 async def list_documents(
     status: str = None,
@@ -142,26 +317,14 @@ async def list_documents(
     """
     try:
         if status:
-            documents = database.get_documents_by_status(status)
+            documents = await asyncio.to_thread(database.get_documents_by_status, status)
         else:
-            documents = database.get_all_documents()
-        
-        # Format response data
-        formatted_documents = []
-        for doc in documents:
-            formatted_doc = {
-                "id": doc["id"],
-                "filename": doc["original_filename"],
-                "upload_date": doc["upload_date"].isoformat() if doc["upload_date"] else None,
-                "status": doc["status"],
-                "last_modified": doc["last_modified"].isoformat() if doc["last_modified"] else None,
-                "error_message": doc["error_message"],
-                "has_extracted_info": doc["extracted_info"] is not None
-            }
-            formatted_documents.append(formatted_doc)
+            documents = await asyncio.to_thread(database.get_all_documents)
         
-        return formatted_documents
+        return [_format_list_entry(doc) for doc in documents]
         
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error listing documents: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve documents")
@@ -182,30 +345,30 @@ async def get_document(
         Document information
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Format response
         formatted_doc = {
-            "id": document["id"],
-            "filename": document["original_filename"],
-            "upload_date": document["upload_date"].isoformat() if document["upload_date"] else None,
-            "status": document["status"],
-            "last_modified": document["last_modified"].isoformat() if document["last_modified"] else None,
-            "error_message": document["error_message"],
-            "extracted_info": document["extracted_info"],
+            "id": document.id,
+            "filename": document.original_filename,
+            "upload_date": document.upload_date,
+            "status": document.status,
+            "last_modified": document.last_modified,
+            "error_message": document.error_message,
+            "extracted_info": document.extracted_info,
             "file_paths": {
-                "raw_copy": document["raw_copy_path"],
-                "html": document["html_path"],
-                "extracted_info": document["extracted_info_path"],
-                "metadata": document["metadata_path"]
+                "raw_copy": document.raw_copy_path,
+                "html": document.html_path,
+                "extracted_info": document.extracted_info_path,
+                "metadata": document.metadata_path
             }
         }
         
         return formatted_doc
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error getting document {doc_id}: {str(e)}")
@@ -227,83 +390,50 @@ async def delete_document(
         Deletion confirmation
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Delete files from filesystem
+        # Delete files from filesystem first; if that fails the record is kept,
+        # so the document stays listed and the delete can be retried
         files_to_delete = [
-            document["upload_path"],
-            document["output_folder"]  # This will delete the entire output folder
+            document.upload_path,
+            document.output_folder  # This will delete the entire output folder
         ]
+        await asyncio.to_thread(_delete_paths, files_to_delete)
         
-        for file_path in files_to_delete:
-            if file_path and Path(file_path).exists():
-                if Path(file_path).is_dir():
-                    shutil.rmtree(file_path)
-                    logger.info(f"Deleted directory: {file_path}")
-                else:
-                    Path(file_path).unlink()
-                    logger.info(f"Deleted file: {file_path}")
-        
-        # Delete from database
-        success = database.delete_document(doc_id)
+        success = await asyncio.to_thread(database.delete_document, doc_id)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete from database")
         
         return {"message": f"Document {doc_id} deleted successfully"}
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error deleting document {doc_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to delete document")
 
-@router.get("/{doc_id}/raw")
-async def get_raw_document(
-    doc_id: str,
-    database = Depends(get_database)
-) -> FileResponse:
+def _delete_paths(paths: List[str]):
     """
-    Serve raw PDF file for viewing
+    Delete files and directories, skipping paths that no longer exist
     
     Args:
-        doc_id: Document ID
-        database: Database instance
-        
-    Returns:
-        PDF file response for browser viewing
+        paths: File or directory paths to delete
     """
-    try:
-        document = database.get_document(doc_id)
-        if not document:
-            raise HTTPException(status_code=404, detail="Document not found")
-        
-        # Get the raw copy path
-        raw_copy_path = document.get("raw_copy_path")
-        if not raw_copy_path:
-            raise HTTPException(status_code=404, detail="Raw document path not found")
-        
-        # Check if file exists
-        file_path = Path(raw_copy_path)
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Document file not found on disk")
-        
-        # Return file response with appropriate headers for PDF viewing
-        return FileResponse(
-            path=str(file_path),
-            media_type="application/pdf",
-            filename=document["original_filename"],
-            headers={
-                "Content-Disposition": f"inline; filename={document['original_filename']}"
-            }
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error serving raw document {doc_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to serve document")
+    for file_path in paths:
+        if not file_path:
+            continue
+        try:
+            mode = os.stat(file_path).st_mode
+        except FileNotFoundError:
+            continue
+        if stat.S_ISDIR(mode):
+            shutil.rmtree(file_path)
+            logger.info(f"Deleted directory: {file_path}")
+        else:
+            os.unlink(file_path)
+            logger.info(f"Deleted file: {file_path}")
 
 @router.get("/stats/overview")
 async def get_database_stats(
@@ -319,14 +449,16 @@ async def get_database_stats(
         Database statistics
     """
     try:
-        stats = database.get_database_stats()
+        stats = await asyncio.to_thread(database.get_database_stats)
         return stats
         
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error getting database stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve statistics")
 
-async def _create_metadata_file(document: Dict[str, Any]):
+async def _create_metadata_file(document: DocumentRow):
     """
     Create metadata.json file for document
     
@@ -335,22 +467,22 @@ async def _create_metadata_file(document: Dict[str, Any]):
     """
     try:
         metadata = {
-            "document_id": document["id"],
-            "original_filename": document["original_filename"],
-            "upload_date": document["upload_date"].isoformat() if document["upload_date"] else None,
-            "status": document["status"],
+            "document_id": document.id,
+            "original_filename": document.original_filename,
+            "upload_date": document.upload_date.isoformat() if document.upload_date else None,
+            "status": document.status,
             "created_at": datetime.now().isoformat(),
             "file_paths": {
-                "raw_copy": document["raw_copy_path"],
-                "html": document["html_path"],
-                "extracted_info": document["extracted_info_path"],
-                "metadata": document["metadata_path"]
+                "raw_copy": document.raw_copy_path,
+                "html": document.html_path,
+                "extracted_info": document.extracted_info_path,
+                "metadata": document.metadata_path
             }
         }
         
-        metadata_path = Path(document["metadata_path"])
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = Path(document.metadata_path)
+        async with aiofiles.open(metadata_path, "wb") as f:
+            await f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         
         logger.debug(f"Created metadata file: {metadata_path}")
         
@@ -361,6 +493,7 @@ async def _create_metadata_file(document: Dict[str, Any]):
 @router.get("/{doc_id}/raw")
 async def get_raw_document(
     doc_id: str,
+    request: Request,
     database = Depends(get_database)
 ):
     """
@@ -368,36 +501,49 @@ async def get_raw_document(
     
     Args:
         doc_id: Document ID
+        request: Incoming request, checked for a matching ETag
         database: Database instance
         
     Returns:
         PDF file response
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Use the raw copy in outputs folder, fall back to uploads folder
-        raw_copy_path = Path(document['raw_copy_path'])
+        raw_copy_path = Path(document.raw_copy_path)
         if raw_copy_path.exists():
             file_path = raw_copy_path
         else:
-            upload_path = Path(document['upload_path'])
+            upload_path = Path(document.upload_path)
             if upload_path.exists():
                 file_path = upload_path
             else:
                 raise HTTPException(status_code=404, detail="PDF file not found")
         
+        # Let viewers seek with range requests and revalidate instead of re-downloading
+        stat_result = file_path.stat()
+        # The raw copy is immutable, so its content hash is a strong validator
+        etag_value = document.sha256 or f'{document.id}-{stat_result.st_mtime_ns}'
+        etag = f'"{etag_value}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
         return FileResponse(
             path=str(file_path),
             media_type='application/pdf',
+            stat_result=stat_result,
             headers={
-                "Content-Disposition": "inline"
+                "Content-Disposition": "inline",
+                "Accept-Ranges": "bytes",
+                "Cache-Control": "private, max-age=300",
+                "ETag": etag
             }
         )
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error serving raw document {doc_id}: {e}")
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
+import asyncio
 import logging
-from pathlib import Path
+import mmap
+import os
+from functools import lru_cache
 
-from ..database import db
+from ..database import db, DatabaseBusyError
 from ..services.extraction_service import extract_information_from_document
 from ..models.schemas import ExtractedInformation
 
@@ -17,11 +20,29 @@ def get_database():
     """Dependency to get database instance"""
     return db
 
+@lru_cache(maxsize=64)
+def _read_html(html_path: str, mtime_ns: int) -> str:
+    """
+    Read parsed HTML through mmap, cached per file version
+    
+    Args:
+        html_path: Path to the parsed HTML file
+        mtime_ns: Modification time of the file, so re-parsing invalidates the cache
+        
+    Returns:
+        Decoded HTML content
+    """
+    with open(html_path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode('utf-8')
+
 @router.post("/extract/{doc_id}")
 async def extract_document_information(
     doc_id: str,
     database = Depends(get_database)
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Extract structured information from a parsed document using LLM
     
@@ -34,42 +55,44 @@ async def extract_document_information(
     """
     try:
         # Get document from database
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Check if document is parsed
-        if document['status'] != 'parsed':
+        if document.status != 'parsed':
             raise HTTPException(
                 status_code=400, 
-                detail=f"Document must be parsed first. Current status: {document['status']}"
+                detail=f"Document must be parsed first. Current status: {document.status}"
             )
         
         # Get HTML file path
-        html_path = document['html_path']
-        if not Path(html_path).exists():
+        html_path = document.html_path
+        try:
+            html_stat = await asyncio.to_thread(os.stat, html_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=500, detail="Parsed HTML file not found")
         
         logger.info(f"Starting information extraction for document {doc_id}")
         
-        # Read HTML content
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        # Read HTML content, reusing the cached copy until the file is re-parsed
+        html_content = await asyncio.to_thread(_read_html, html_path, html_stat.st_mtime_ns)
         
         # Extract information using LLM service
         try:
-            extracted_info = extract_information_from_document(html_content)
+            extracted_info = await extract_information_from_document(html_content)
+            extracted_data = extracted_info.model_dump(mode="json")
             
             # Store extracted information in document metadata
-            database.update_extracted_info(doc_id, extracted_info.model_dump())
+            await asyncio.to_thread(database.update_extracted_info, doc_id, extracted_data)
             
             logger.info(f"Successfully extracted information from document {doc_id}")
             
-            return JSONResponse(
+            return ORJSONResponse(
                 content={
                     "message": "Information extracted successfully",
                     "doc_id": doc_id,
-                    "extracted_information": extracted_info.model_dump()
+                    "extracted_information": extracted_data
                 },
                 status_code=200
             )
@@ -83,7 +106,7 @@ async def extract_document_information(
                 detail=f"Information extraction failed: {str(extraction_error)}"
             )
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error extracting information from document {doc_id}: {e}")
@@ -105,11 +128,11 @@ async def get_extracted_information(
         Extracted information or error message
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        extracted_info = document.get('extracted_info')
+        extracted_info = document.extracted_info
         if not extracted_info:
             raise HTTPException(
                 status_code=404, 
@@ -118,12 +141,12 @@ async def get_extracted_information(
         
         return {
             "doc_id": doc_id,
-            "filename": document["original_filename"],
+            "filename": document.original_filename,
             "extracted_information": extracted_info,
-            "last_modified": document["last_modified"].isoformat() if document["last_modified"] else None
+            "last_modified": document.last_modified
         }
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error getting extracted information for document {doc_id}: {e}")
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
+from fastapi.responses import ORJSONResponse, FileResponse
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
-from pathlib import Path
-import shutil
+import os
+import aiofiles
+from cachetools import TTLCache
 
-from ..database import db
-from ..services.ocr_service import process_pdf_to_markdown
+from ..database import db, DatabaseBusyError
+from ..models.document import DocumentRow
+from ..services.file_service import link_or_copy
+from ..services.ocr_service import run_ocr_job
 from ..services.progress_manager import progress_manager
 
 # Configure logging
@@ -14,30 +18,51 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/parsing", tags=["parsing"])
 
+# Poll responses, keyed on (doc_id, last_modified) so any database write invalidates them
+_status_cache = TTLCache(maxsize=1024, ttl=1.0)
+_content_cache = TTLCache(maxsize=32, ttl=3600.0)
+
 def get_database():
     """Dependency to get database instance"""
     return db
 
-def background_parse_document(doc_id: str, raw_copy_path: str, html_path: str, database):
+async def _run_ocr(doc_id: str, raw_copy_path: str, html_path: str, database):
+    """Run OCR for a document in the worker process pool and record the result"""
+    # OCR runs in worker processes so it cannot starve the API event loop
+    await run_ocr_job(raw_copy_path, html_path, doc_id)
+    
+    # Workers have no database handle, so the API process records the result
+    await asyncio.to_thread(database.update_document_status, doc_id, 'parsed')
+
+async def background_parse_document(doc_id: str, raw_copy_path: str, html_path: str, database):
     """Background task to process document with progress tracking"""
     try:
-        # Process the document with progress tracking - now handles database updates internally
-        process_pdf_to_markdown(raw_copy_path, html_path, doc_id, database)
+        await _run_ocr(doc_id, raw_copy_path, html_path, database)
         
-        logger.info(f"Successfully parsed document {doc_id}")
+        logger.info("Successfully parsed document %s", doc_id)
         
     except Exception as ocr_error:
         error_message = f"OCR processing failed: {str(ocr_error)}"
-        database.update_document_status(doc_id, 'error', error_message)
+        await asyncio.to_thread(database.update_document_status, doc_id, 'error', error_message)
         progress_manager.set_status(doc_id, 'error', error_message)
-        logger.error(f"OCR failed for document {doc_id}: {ocr_error}")
+        logger.error("OCR failed for document %s: %s", doc_id, ocr_error)
+
+async def background_parse_batch(documents: List[DocumentRow], database):
+    """Background task to parse the documents started by a batch concurrently"""
+    # Concurrency is bounded by the OCR process pool
+    await asyncio.gather(*(
+        background_parse_document(
+            document.id, document.raw_copy_path, document.html_path, database
+        )
+        for document in documents
+    ))
 
 @router.post("/parse/{doc_id}")
 async def parse_document(
     doc_id: str,
     background_tasks: BackgroundTasks,
     database = Depends(get_database)
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Parse a single document using OCR
     
@@ -50,13 +75,13 @@ async def parse_document(
     """
     try:
         # Get document from database
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Check if document is already being processed
-        if document['status'] == 'parsing':
-            return JSONResponse(
+        if document.status == 'parsing':
+            return ORJSONResponse(
                 content={
                     "message": "Document is already being parsed",
                     "doc_id": doc_id,
@@ -66,8 +91,8 @@ async def parse_document(
             )
         
         # Check if document is already parsed
-        if document['status'] == 'parsed':
-            return JSONResponse(
+        if document.status == 'parsed':
+            return ORJSONResponse(
                 content={
                     "message": "Document is already parsed",
                     "doc_id": doc_id,
@@ -76,23 +101,26 @@ async def parse_document(
                 status_code=200
             )
         
-        # Update status to parsing
-        database.update_document_status(doc_id, 'parsing')
-        logger.info(f"Starting to parse document {doc_id}")
+        # Update status to parsing, reopening any finished progress from an earlier run
+        await asyncio.to_thread(database.update_document_status, doc_id, 'parsing')
+        progress_manager.set_status(doc_id, 'processing')
+        logger.info("Starting to parse document %s", doc_id)
         
         # Get file paths
-        raw_copy_path = document['raw_copy_path']
-        html_path = document['html_path']
+        raw_copy_path = document.raw_copy_path
+        html_path = document.html_path
         
         # Ensure raw copy exists
-        if not Path(raw_copy_path).exists():
+        if not os.path.exists(raw_copy_path):
             # Copy from upload path if raw copy doesn't exist
-            upload_path = document['upload_path']
-            if Path(upload_path).exists():
-                shutil.copy2(upload_path, raw_copy_path)
-                logger.info(f"Copied file from {upload_path} to {raw_copy_path}")
+            upload_path = document.upload_path
+            if os.path.exists(upload_path):
+                await asyncio.to_thread(link_or_copy, upload_path, raw_copy_path)
+                logger.info("Copied file from %s to %s", upload_path, raw_copy_path)
             else:
-                database.update_document_status(doc_id, 'error', 'Source file not found')
+                await asyncio.to_thread(
+                    database.update_document_status, doc_id, 'error', 'Source file not found'
+                )
                 raise HTTPException(status_code=500, detail="Source file not found")
         
         # Start background processing
@@ -105,7 +133,7 @@ async def parse_document(
         )
         
         # Return immediately with accepted status
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": "Document parsing started",
                 "doc_id": doc_id,
@@ -114,95 +142,75 @@ async def parse_document(
             status_code=202  # Accepted - processing in background
         )
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
-        logger.error(f"Error parsing document {doc_id}: {e}")
-        database.update_document_status(doc_id, 'error', str(e))
+        logger.error("Error parsing document %s: %s", doc_id, e)
+        await asyncio.to_thread(database.update_document_status, doc_id, 'error', str(e))
         raise HTTPException(status_code=500, detail=f"Failed to parse document: {str(e)}")
 
 @router.post("/parse-batch")
 async def parse_multiple_documents(
     doc_ids: List[str],
+    background_tasks: BackgroundTasks,
     database = Depends(get_database)
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
-    Parse multiple documents in batch
+    Start parsing multiple documents in batch
+    
+    OCR runs in the background; clients poll /progress/{doc_id} for completion.
     
     Args:
         doc_ids: List of document IDs to parse
         database: Database instance
         
     Returns:
-        JSON response with batch parsing results
+        JSON response listing which documents were started, skipped or rejected
     """
     try:
         results = {
             "total_requested": len(doc_ids),
-            "processed": [],
+            "started": [],
             "already_parsed": [],
             "failed": [],
             "not_found": []
         }
         
-        logger.info(f"Starting batch parsing for {len(doc_ids)} documents")
+        logger.info("Starting batch parsing for %s documents", len(doc_ids))
         
-        for doc_id in doc_ids:
-            try:
-                # Get document
-                document = database.get_document(doc_id)
-                if not document:
-                    results["not_found"].append(doc_id)
-                    continue
-                
-                # Skip if already parsed
-                if document['status'] == 'parsed':
-                    results["already_parsed"].append(doc_id)
-                    continue
-                
-                # Skip if currently parsing
-                if document['status'] == 'parsing':
-                    continue
-                
-                # Update status to parsing
-                database.update_document_status(doc_id, 'parsing')
-                
-                # Get file paths
-                raw_copy_path = document['raw_copy_path']
-                html_path = document['html_path']
-                
-                # Ensure raw copy exists
-                if not Path(raw_copy_path).exists():
-                    upload_path = document['upload_path']
-                    if Path(upload_path).exists():
-                        shutil.copy2(upload_path, raw_copy_path)
-                    else:
-                        database.update_document_status(doc_id, 'error', 'Source file not found')
-                        results["failed"].append({"doc_id": doc_id, "error": "Source file not found"})
-                        continue
-                
-                # Process the document
-                try:
-                    process_pdf_to_markdown(raw_copy_path, html_path, doc_id, database)
-                    results["processed"].append({
-                        "doc_id": doc_id,
-                        "status": "parsed"
-                    })
-                    logger.info(f"Successfully parsed document {doc_id} in batch")
-                    
-                except Exception as ocr_error:
-                    error_message = f"OCR processing failed: {str(ocr_error)}"
-                    database.update_document_status(doc_id, 'error', error_message)
-                    results["failed"].append({"doc_id": doc_id, "error": str(ocr_error)})
-                    logger.error(f"OCR failed for document {doc_id}: {ocr_error}")
-                
-            except Exception as e:
-                database.update_document_status(doc_id, 'error', str(e))
-                results["failed"].append({"doc_id": doc_id, "error": str(e)})
-                logger.error(f"Error processing document {doc_id}: {e}")
+        # Look up all requested documents in a single query; a repeated ID is parsed once
+        unique_ids = list(dict.fromkeys(doc_ids))
+        documents = await asyncio.to_thread(database.get_documents_by_ids, unique_ids)
+        found_ids = []
+        for doc_id in unique_ids:
+            if doc_id in documents:
+                found_ids.append(doc_id)
+            else:
+                results["not_found"].append(doc_id)
+        
+        # Prepare all documents concurrently
+        outcomes = await asyncio.gather(
+            *(_start_batch_document(documents[doc_id], database) for doc_id in found_ids),
+            return_exceptions=True
+        )
+        
+        started = []
+        for doc_id, outcome in zip(found_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                results["failed"].append({"doc_id": doc_id, "error": str(outcome)})
+                logger.error("Error processing document %s: %s", doc_id, outcome)
+            elif outcome:
+                bucket, entry = outcome
+                results[bucket].append(entry)
+                if bucket == "started":
+                    started.append(documents[doc_id])
+        
+        # Run OCR after responding, so the request doesn't wait for every document
+        if started:
+            background_tasks.add_task(background_parse_batch, started, database)
         
         # Calculate success rate
-        total_processed = len(results["processed"]) + len(results["already_parsed"])
+        total_processed = len(results["started"]) + len(results["already_parsed"])
         success_rate = (total_processed / len(doc_ids)) * 100 if doc_ids else 0
         
         results["summary"] = {
@@ -210,14 +218,65 @@ async def parse_multiple_documents(
             "success_rate": round(success_rate, 2)
         }
         
-        logger.info(f"Batch parsing completed. Success rate: {success_rate}%")
+        logger.info("Batch parsing started for %s documents", len(started))
         
-        return JSONResponse(content=results, status_code=200)
+        return ORJSONResponse(content=results, status_code=202)
         
+    except DatabaseBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Error in batch parsing: {e}")
+        logger.error("Error in batch parsing: %s", e)
         raise HTTPException(status_code=500, detail=f"Batch parsing failed: {str(e)}")
 
+async def _start_batch_document(document: DocumentRow, database) -> Optional[Tuple[str, Any]]:
+    """
+    Prepare a single document for parsing as part of a batch
+    
+    Args:
+        document: Document to parse
+        database: Database instance
+        
+    Returns:
+        Tuple of (results bucket, entry), or None if the document is already being parsed
+    """
+    doc_id = document.id
+    try:
+        # Skip if already parsed
+        if document.status == 'parsed':
+            return "already_parsed", doc_id
+        
+        # Skip if currently parsing
+        if document.status == 'parsing':
+            return None
+        
+        # Update status to parsing, reopening any finished progress from an earlier run
+        await asyncio.to_thread(database.update_document_status, doc_id, 'parsing')
+        progress_manager.set_status(doc_id, 'processing')
+        
+        # Get file paths
+        raw_copy_path = document.raw_copy_path
+        html_path = document.html_path
+        
+        # Ensure raw copy exists
+        if not os.path.exists(raw_copy_path):
+            upload_path = document.upload_path
+            if os.path.exists(upload_path):
+                await asyncio.to_thread(link_or_copy, upload_path, raw_copy_path)
+            else:
+                await asyncio.to_thread(
+                    database.update_document_status, doc_id, 'error', 'Source file not found'
+                )
+                return "failed", {"doc_id": doc_id, "error": "Source file not found"}
+        
+        return "started", {"doc_id": doc_id, "status": "parsing"}
+        
+    except DatabaseBusyError:
+        # A lock timeout is transient; don't mark the document as failed
+        raise
+    except Exception as e:
+        await asyncio.to_thread(database.update_document_status, doc_id, 'error', str(e))
+        raise
+
 @router.get("/status/{doc_id}")
 async def get_parsing_status(
     doc_id: str,
@@ -234,35 +293,41 @@ async def get_parsing_status(
         Document parsing status information
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
+        cache_key = (doc_id, document.last_modified)
+        status_info = _status_cache.get(cache_key)
+        if status_info is not None:
+            return status_info
+        
         # Build status response
         status_info = {
             "doc_id": doc_id,
-            "filename": document["original_filename"],
-            "status": document["status"],
-            "upload_date": document["upload_date"].isoformat() if document["upload_date"] else None,
-            "last_modified": document["last_modified"].isoformat() if document["last_modified"] else None,
-            "error_message": document.get("error_message")
+            "filename": document.original_filename,
+            "status": document.status,
+            "upload_date": document.upload_date,
+            "last_modified": document.last_modified,
+            "error_message": document.error_message
         }
         
         # Add file information if parsed
-        if document["status"] == "parsed":
-            html_path = document["html_path"]
-            if Path(html_path).exists():
+        if document.status == "parsed":
+            try:
+                html_stat = await asyncio.to_thread(os.stat, document.html_path)
                 status_info["html_available"] = True
-                status_info["html_size"] = Path(html_path).stat().st_size
-            else:
+                status_info["html_size"] = html_stat.st_size
+            except FileNotFoundError:
                 status_info["html_available"] = False
         
+        _status_cache[cache_key] = status_info
         return status_info
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
-        logger.error(f"Error getting status for document {doc_id}: {e}")
+        logger.error("Error getting status for document %s: %s", doc_id, e)
         raise HTTPException(status_code=500, detail="Failed to get document status")
 
 @router.get("/progress/{doc_id}")
@@ -282,7 +347,7 @@ async def get_parsing_progress(
     """
     try:
         # Check if document exists
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
@@ -293,7 +358,7 @@ async def get_parsing_progress(
             # No progress data - return based on document status
             return {
                 "doc_id": doc_id,
-                "status": document["status"],
+                "status": document.status,
                 "task": None,
                 "percentage": 0,
                 "progress_info": None,
@@ -302,7 +367,7 @@ async def get_parsing_progress(
         
         return {
             "doc_id": doc_id,
-            "status": progress_data.get("status", document["status"]),
+            "status": progress_data.get("status", document.status),
             "task": progress_data.get("task"),
             "percentage": progress_data.get("percentage", 0),
             "progress_info": progress_data.get("progress_info"),
@@ -310,10 +375,10 @@ async def get_parsing_progress(
             "error_message": progress_data.get("error_message")
         }
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
-        logger.error(f"Error getting progress for document {doc_id}: {e}")
+        logger.error("Error getting progress for document %s: %s", doc_id, e)
         raise HTTPException(status_code=500, detail="Failed to get parsing progress")
 
 @router.get("/{doc_id}/content")
@@ -332,34 +397,85 @@ async def get_parsed_content(
         Parsed content or error message
     """
     try:
-        document = database.get_document(doc_id)
+        document = await asyncio.to_thread(database.get_document, doc_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        if document["status"] != "parsed":
+        if document.status != "parsed":
             raise HTTPException(
                 status_code=400, 
-                detail=f"Document not parsed yet. Current status: {document['status']}"
+                detail=f"Document not parsed yet. Current status: {document.status}"
             )
         
-        html_path = document["html_path"]
-        if not Path(html_path).exists():
+        # Parsed content only changes when the document is re-parsed
+        cache_key = (doc_id, document.last_modified)
+        content_info = _content_cache.get(cache_key)
+        if content_info is not None:
+            return content_info
+        
+        # Read HTML content without blocking the event loop
+        try:
+            async with aiofiles.open(document.html_path, 'r', encoding='utf-8') as f:
+                content = await f.read()
+        except FileNotFoundError:
             raise HTTPException(status_code=500, detail="Parsed content file not found")
         
-        # Read HTML content
-        with open(html_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return {
+        content_info = {
             "doc_id": doc_id,
-            "filename": document["original_filename"],
+            "filename": document.original_filename,
             "content": content,
             "content_length": len(content),
-            "last_modified": document["last_modified"].isoformat() if document["last_modified"] else None
+            "last_modified": document.last_modified
         }
+        _content_cache[cache_key] = content_info
+        return content_info
+        
+    except (HTTPException, DatabaseBusyError):
+        raise
+    except Exception as e:
+        logger.error("Error getting content for document %s: %s", doc_id, e)
+        raise HTTPException(status_code=500, detail="Failed to get document content")
+
+@router.get("/{doc_id}/content.html")
+async def get_parsed_content_file(
+    doc_id: str,
+    database = Depends(get_database)
+) -> FileResponse:
+    """
+    Download the parsed HTML file for a document
+    
+    Args:
+        doc_id: Document ID
+        database: Database instance
+        
+    Returns:
+        The parsed HTML file, streamed from disk
+    """
+    try:
+        document = await asyncio.to_thread(database.get_document, doc_id)
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+        
+        if document.status != "parsed":
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Document not parsed yet. Current status: {document.status}"
+            )
+        
+        try:
+            html_stat = await asyncio.to_thread(os.stat, document.html_path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=500, detail="Parsed content file not found")
+        
+        return FileResponse(
+            path=document.html_path,
+            media_type="text/html",
+            filename=f"{doc_id}.html",
+            stat_result=html_stat
+        )
         
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
-        logger.error(f"Error getting content for document {doc_id}: {e}")
+        logger.error("Error serving content file for document %s: %s", doc_id, e)
         raise HTTPException(status_code=500, detail="Failed to get document content")
\ No newline at end of file
@@ -1,141 +1,372 @@
-import pandas as pd
+import sqlite3
 import pickle
+import json
 import os
 import uuid
+import dataclasses
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from contextlib import contextmanager
+from functools import cached_property
 import logging
+import threading
+import time
+from cachetools import TTLCache
+
+from .models.document import DocumentRow
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Backend directories, resolved once at import
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+OUTPUTS_DIR = BACKEND_DIR / "outputs"
+DATABASE_DIR = BACKEND_DIR / "database"
+
+# Table columns, in storage order
+COLUMNS = (
+    'id',                   # UUID string
+    'original_filename',    # User's original filename
+    'upload_date',          # Upload timestamp (ISO 8601)
+    'status',               # uploaded/parsing/parsed/error
+    'upload_path',          # Path to raw file in uploads/
+    'output_folder',        # Path to outputs/{uid}/ folder
+    'raw_copy_path',        # Path to raw copy in outputs/{uid}/
+    'html_path',            # Path to .html file in outputs/{uid}/
+    'extracted_info_path',  # Path to extracted info JSON
+    'metadata_path',        # Path to metadata JSON
+    'sha256',               # SHA-256 hex digest of the uploaded file
+    'extracted_info',       # Cached extracted info (JSON text)
+    'error_message',        # Error details if failed
+    'last_modified'         # Last modification timestamp (ISO 8601)
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    original_filename TEXT NOT NULL,
+    upload_date TEXT,
+    status TEXT NOT NULL,
+    upload_path TEXT,
+    output_folder TEXT,
+    raw_copy_path TEXT,
+    html_path TEXT,
+    extracted_info_path TEXT,
+    metadata_path TEXT,
+    sha256 TEXT,
+    extracted_info TEXT,
+    error_message TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status);
+CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents (sha256);
+"""
+
+# Bumped whenever a one-off data migration is added; stored in PRAGMA user_version
+#   1: documents table created
+#   2: legacy pickle database imported, with markdown_path migrated to html_path
+SCHEMA_VERSION = 2
+
+# Rows are selected in COLUMNS order, which matches DocumentRow's field order
+SELECT_DOCUMENTS = f"SELECT {', '.join(COLUMNS)} FROM documents"
+
+INSERT_DOCUMENT = (
+    f"INSERT OR REPLACE INTO documents ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+
+class DatabaseBusyError(Exception):
+    """Raised when the database lock cannot be acquired in time"""
+
 class DocumentDatabase:
-    """Simple class for managing document database using pandas DataFrame"""
-    
+    """Simple class for managing the document database in SQLite"""
+
     _instance = None
-    
+    _instance_lock = threading.Lock()
+
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
-    
+
     def __init__(self):
-        if self._initialized:
-            return
-            
-        self.db_path = Path(__file__).parent.parent / "database"
-        self.pickle_file = self.db_path / "documents_db.pkl"
-        self.backup_file = self.db_path / "documents_db_backup.pkl"
-        
+        with self._instance_lock:
+            if self._initialized:
+                return
+            self._setup()
+            self._initialized = True
+
+    def _setup(self):
+        """Set up paths, locks and caches; the database itself is opened on first use"""
+        self.db_path = DATABASE_DIR
+        self.db_file = self.db_path / "documents.db"
+        self.backup_file = self.db_path / "documents_backup.db"
+        self.legacy_pickle_file = self.db_path / "documents_db.pkl"
+
         # Ensure database directory exists
         self.db_path.mkdir(exist_ok=True)
-        
-        # Initialize DataFrame with schema
-        self.df_columns = [
-            'id',                    # UUID string
-            'original_filename',     # User's original filename
-            'upload_date',          # Upload timestamp
-            'status',               # uploaded/parsing/parsed/error
-            'upload_path',          # Path to raw file in uploads/
-            'output_folder',        # Path to outputs/{uid}/ folder
-            'raw_copy_path',        # Path to raw copy in outputs/{uid}/
-            'html_path',            # Path to .html file in outputs/{uid}/
-            'extracted_info_path',  # Path to extracted info JSON
-            'metadata_path',        # Path to metadata JSON
-            'extracted_info',       # Cached extracted info dict
-            'error_message',        # Error details if failed
-            'last_modified'         # Last modification timestamp
-        ]
-        
-        # Load existing data or create new DataFrame
-        self._load_database()
-        self._initialized = True
-        
-        logger.info(f"DocumentDatabase initialized with {len(self.df)} records")
-    
-    def _load_database(self):
-        """Load database from pickle file or create new DataFrame"""
+
+        # Serialize connection access; API handlers call in from worker threads
+        self._lock = threading.RLock()
+        self.lock_timeout = float(os.getenv('DB_LOCK_TIMEOUT', '5'))
+
+        # Short-lived read caches for hot lookups, invalidated on every write
+        self._doc_cache = TTLCache(maxsize=4096, ttl=5.0)
+        self._list_cache = TTLCache(maxsize=16, ttl=5.0)
+
+        # Column updates not yet written, coalesced per document and flushed periodically
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self.flush_interval = float(os.getenv('DB_FLUSH_INTERVAL', '0.2'))
+
+        # Snapshot the database periodically rather than on every write
+        self.backup_interval = float(os.getenv('DB_BACKUP_INTERVAL', '3600'))
+
+    @cached_property
+    def conn(self) -> sqlite3.Connection:
+        """Database connection, opened on first use so importing this module stays cheap"""
+        # Every access happens under the database lock, so the connection is opened once
+        with self._lock:
+            conn = self._load_database()
+
+            # Background writer for coalesced updates
+            self._writer = threading.Thread(target=self._flush_loop, name="db-writer", daemon=True)
+            self._writer.start()
+
+        return conn
+
+    def _load_database(self) -> sqlite3.Connection:
+        """Open the SQLite database, creating the schema and running pending migrations"""
+        # Autocommit mode; multi-statement writes use explicit transactions
+        conn = sqlite3.connect(
+            str(self.db_file),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        logger.info("Opened database %s", self.db_file)
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._migrate(conn, version)
+
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection, version: int):
+        """Bring the database up to SCHEMA_VERSION; each step runs exactly once"""
+        if version < 2:
+            # Only import into an empty table so existing rows are never overwritten
+            is_empty = conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone() is None
+            if is_empty and self.legacy_pickle_file.exists():
+                if not self._import_legacy_pickle(conn):
+                    # Leave the version as is so the import is retried on next start
+                    return
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        logger.info("Migrated database from schema version %s to %s", version, SCHEMA_VERSION)
+
+    def _import_legacy_pickle(self, conn: sqlite3.Connection) -> bool:
+        """Import records from the pickled DataFrame used by earlier versions"""
         try:
-            if self.pickle_file.exists():
-                with open(self.pickle_file, 'rb') as f:
-                    self.df = pickle.load(f)
-                logger.info(f"Loaded database from {self.pickle_file}")
-                
-                # Validate DataFrame structure and handle column migration
-                missing_cols = set(self.df_columns) - set(self.df.columns)
-                if missing_cols:
-                    logger.warning(f"Adding missing columns: {missing_cols}")
-                    for col in missing_cols:
-                        self.df[col] = None
-                
-                # Handle migration from markdown_path to html_path
-                if 'markdown_path' in self.df.columns and 'html_path' not in self.df.columns:
-                    logger.info("Migrating markdown_path to html_path")
-                    self.df['html_path'] = self.df['markdown_path'].str.replace('.md', '.html')
-                    self.df.drop('markdown_path', axis=1, inplace=True)
-                    self._save_database()
-                    logger.info("Migration completed")
-                        
-            else:
-                # Create new DataFrame
-                self.df = pd.DataFrame(columns=self.df_columns)
-                self.df.set_index('id', inplace=True)
-                logger.info("Created new database DataFrame")
-                
+            with open(self.legacy_pickle_file, 'rb') as f:
+                df = pickle.load(f)
         except Exception as e:
-            logger.error(f"Error loading database: {e}")
-            # Try backup file
-            if self.backup_file.exists():
-                try:
-                    with open(self.backup_file, 'rb') as f:
-                        self.df = pickle.load(f)
-                    logger.info("Loaded database from backup file")
-                except Exception as backup_error:
-                    logger.error(f"Error loading backup: {backup_error}")
-                    self._create_empty_dataframe()
-            else:
-                self._create_empty_dataframe()
-    
-    def _create_empty_dataframe(self):
-        """Create empty DataFrame with proper schema"""
-        self.df = pd.DataFrame(columns=self.df_columns)
-        self.df.set_index('id', inplace=True)
-        logger.info("Created empty DataFrame")
-    
-    def _save_database(self):
-        """Save DataFrame to pickle file with backup"""
+            logger.error("Error loading legacy database %s: %s", self.legacy_pickle_file, e)
+            return False
+
+        # Handle migration from markdown_path to html_path
+        if 'markdown_path' in df.columns and 'html_path' not in df.columns:
+            logger.info("Migrating markdown_path to html_path")
+            df['html_path'] = df['markdown_path'].str.replace('.md', '.html')
+
+        # Missing values become None rather than NaN/NaT
+        df = df.astype(object).where(df.notna(), None)
+        records = df.to_dict(orient='index')
+
+        with self._transaction(conn):
+            conn.executemany(
+                INSERT_DOCUMENT,
+                [self._to_row_values(doc_id, record) for doc_id, record in records.items()]
+            )
+        logger.info("Imported %s documents from %s", len(records), self.legacy_pickle_file)
+        return True
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection = None):
+        """Run the enclosed statements in a single transaction"""
+        conn = conn or self.conn
+        conn.execute("BEGIN")
         try:
-            # Create backup of existing file
-            if self.pickle_file.exists():
-                self.pickle_file.replace(self.backup_file)
-            
-            # Save current DataFrame
-            with open(self.pickle_file, 'wb') as f:
-                pickle.dump(self.df, f)
-            
-            logger.debug("Database saved successfully")
-            
-        except Exception as e:
-            logger.error(f"Error saving database: {e}")
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
             raise
-    
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _to_storage(column: str, value: Any) -> Any:
+        """Convert a single column value for storage"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if column == 'extracted_info' and value is not None:
+            return json.dumps(value)
+        return value
+
+    @classmethod
+    def _to_row_values(cls, doc_id: str, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Convert a document record to column values for storage"""
+        return tuple(
+            doc_id if column == 'id' else cls._to_storage(column, record.get(column))
+            for column in COLUMNS
+        )
+
+    @staticmethod
+    def _row_to_document(row: Tuple[Any, ...]) -> DocumentRow:
+        """Convert a stored row back to a document"""
+        (doc_id, original_filename, upload_date, status, upload_path, output_folder,
+         raw_copy_path, html_path, extracted_info_path, metadata_path, sha256,
+         extracted_info, error_message, last_modified) = row
+        return DocumentRow(
+            doc_id,
+            original_filename,
+            datetime.fromisoformat(upload_date) if upload_date else None,
+            status,
+            upload_path,
+            output_folder,
+            raw_copy_path,
+            html_path,
+            extracted_info_path,
+            metadata_path,
+            sha256,
+            json.loads(extracted_info) if extracted_info is not None else None,
+            error_message,
+            datetime.fromisoformat(last_modified) if last_modified else None
+        )
+
+    @contextmanager
+    def _locked(self):
+        """Acquire the database lock, failing fast instead of queueing indefinitely"""
+        if not self._lock.acquire(timeout=self.lock_timeout):
+            raise DatabaseBusyError(f"Timed out after {self.lock_timeout}s waiting for the database")
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def _queue_update(self, doc_id: str, changes: Dict[str, Any]) -> bool:
+        """Record column changes for the next flush; returns False if the document does not exist"""
+        if self._get_document_locked(doc_id) is None:
+            return False
+        self._pending.setdefault(doc_id, {}).update(changes)
+        self._invalidate_cache(doc_id)
+        return True
+
+    def _flush_locked(self):
+        """Write all pending updates in one transaction; caller must hold the lock"""
+        if not self._pending:
+            return
+        with self._transaction():
+            for doc_id, changes in self._pending.items():
+                self.conn.execute(
+                    f"UPDATE documents SET {', '.join(f'{column} = ?' for column in changes)} WHERE id = ?",
+                    (*(self._to_storage(column, value) for column, value in changes.items()), doc_id)
+                )
+        logger.debug("Flushed updates for %s documents", len(self._pending))
+        self._pending.clear()
+
+    def flush(self):
+        """Write any pending updates to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def backup(self):
+        """Write a consistent snapshot of the database to the backup file"""
+        tmp_file = self.backup_file.with_suffix('.tmp')
+        target = sqlite3.connect(str(tmp_file))
+        try:
+            with self._lock:
+                self._flush_locked()
+                self.conn.backup(target)
+        finally:
+            target.close()
+
+        # Atomic rename so a valid backup exists at all times
+        os.replace(tmp_file, self.backup_file)
+        logger.info("Database backed up to %s", self.backup_file)
+
+    def _flush_loop(self):
+        """Periodically flush coalesced updates and back up from a background thread"""
+        last_backup = time.monotonic()
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+                if time.monotonic() - last_backup >= self.backup_interval:
+                    last_backup = time.monotonic()
+                    self.backup()
+            except Exception as e:
+                logger.error("Error in database writer: %s", e)
+
+    def _invalidate_cache(self, doc_id: str):
+        """Drop cached reads affected by a write to the given document"""
+        self._doc_cache.pop(doc_id, None)
+        self._list_cache.clear()
+
     def add_document(self, original_filename: str, upload_path: str) -> str:
         """Add new document to database and return document ID"""
+        return self.add_documents_bulk([{
+            'original_filename': original_filename,
+            'upload_path': upload_path
+        }])[0]
+
+    def add_documents_bulk(self, documents: List[Dict[str, str]]) -> List[str]:
+        """Add several documents in a single transaction and return their IDs in order"""
+        records = [
+            self._create_document_record(
+                document['original_filename'],
+                document['upload_path'],
+                document.get('sha256')
+            )
+            for document in documents
+        ]
+
+        with self._locked():
+            with self._transaction():
+                self.conn.executemany(
+                    INSERT_DOCUMENT,
+                    [self._to_row_values(doc_id, document_data) for doc_id, document_data in records]
+                )
+            for doc_id, _ in records:
+                self._invalidate_cache(doc_id)
+
+        # Only create output folders once the records are committed, so a failed insert leaves none
+        for _, document_data in records:
+            Path(document_data['output_folder']).mkdir(exist_ok=True)
+
+        for doc_id, document_data in records:
+            logger.info("Added document %s: %s", doc_id, document_data['original_filename'])
+
+        return [doc_id for doc_id, _ in records]
+
+    def _create_document_record(self, original_filename: str, upload_path: str, sha256: str = None):
+        """Create the database record for a new document; its output folder is created on insert"""
         doc_id = str(uuid.uuid4())
-        
-        # Create output folder structure
-        output_folder = Path(__file__).parent.parent / "outputs" / doc_id
-        output_folder.mkdir(exist_ok=True)
-        
+
+        # Output folder structure
+        output_folder = OUTPUTS_DIR / doc_id
+
         # Define paths for all files in output folder
         raw_copy_path = output_folder / original_filename
         html_path = output_folder / f"{Path(original_filename).stem}.html"
         extracted_info_path = output_folder / "extracted_info.json"
         metadata_path = output_folder / "metadata.json"
-        
+
         # Create document record
         document_data = {
             'original_filename': original_filename,
@@ -147,85 +378,137 @@ class DocumentDatabase:
             'html_path': str(html_path),
             'extracted_info_path': str(extracted_info_path),
             'metadata_path': str(metadata_path),
+            'sha256': sha256,
             'extracted_info': None,
             'error_message': None,
             'last_modified': datetime.now()
         }
-        
-        # Add to DataFrame
-        self.df.loc[doc_id] = document_data
-        
-        # Save to pickle file
-        self._save_database()
-        
-        logger.info(f"Added document {doc_id}: {original_filename}")
-        
-        return doc_id
-    
-    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+
+        return doc_id, document_data
+
+    def get_document(self, doc_id: str) -> Optional[DocumentRow]:
         """Get document by ID"""
-        if doc_id in self.df.index:
-            doc_data = self.df.loc[doc_id].to_dict()
-            doc_data['id'] = doc_id
-            return doc_data
-        return None
-    
-    def get_all_documents(self) -> List[Dict[str, Any]]:
-        """Get all documents as list of dictionaries"""
-        documents = []
-        for doc_id, row in self.df.iterrows():
-            doc_data = row.to_dict()
-            doc_data['id'] = doc_id
-            documents.append(doc_data)
+        with self._locked():
+            return self._get_document_locked(doc_id)
+
+    def _get_document_locked(self, doc_id: str) -> Optional[DocumentRow]:
+        """Get document by ID, including pending updates; caller must hold the lock"""
+        document = self._doc_cache.get(doc_id)
+        if document is None:
+            row = self.conn.execute(
+                f"{SELECT_DOCUMENTS} WHERE id = ?", (doc_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            document = self._row_to_document(row)
+            if doc_id in self._pending:
+                document = dataclasses.replace(document, **self._pending[doc_id])
+            self._doc_cache[doc_id] = document
+        return document
+
+    def get_documents_by_ids(self, doc_ids: List[str]) -> Dict[str, DocumentRow]:
+        """Get several documents by ID in one query, keyed by ID; unknown IDs are left out"""
+        documents = {}
+        with self._locked():
+            missing = []
+            for doc_id in dict.fromkeys(doc_ids):
+                document = self._doc_cache.get(doc_id)
+                if document is None:
+                    missing.append(doc_id)
+                else:
+                    documents[doc_id] = document
+
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self.conn.execute(
+                    f"{SELECT_DOCUMENTS} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    document = self._row_to_document(row)
+                    if document.id in self._pending:
+                        document = dataclasses.replace(document, **self._pending[document.id])
+                    self._doc_cache[document.id] = document
+                    documents[document.id] = document
         return documents
-    
+
+    def get_document_by_sha(self, sha256: str) -> Optional[DocumentRow]:
+        """Get the first document whose uploaded file has the given SHA-256 digest"""
+        with self._locked():
+            self._flush_locked()
+            row = self.conn.execute(
+                f"{SELECT_DOCUMENTS} WHERE sha256 = ? ORDER BY upload_date LIMIT 1", (sha256,)
+            ).fetchone()
+        return self._row_to_document(row) if row else None
+
+    def get_all_documents(self) -> List[DocumentRow]:
+        """Get all documents"""
+        with self._locked():
+            documents = self._list_cache.get(None)
+            if documents is None:
+                self._flush_locked()
+                rows = self.conn.execute(f"{SELECT_DOCUMENTS} ORDER BY upload_date").fetchall()
+                documents = list(map(self._row_to_document, rows))
+                self._list_cache[None] = documents
+        return list(documents)
+
     def update_document_status(self, doc_id: str, status: str, error_message: str = None):
         """Update document status"""
-        if doc_id in self.df.index:
-            self.df.loc[doc_id, 'status'] = status
-            self.df.loc[doc_id, 'last_modified'] = datetime.now()
-            if error_message:
-                self.df.loc[doc_id, 'error_message'] = error_message
-            self._save_database()
-            logger.info(f"Updated document {doc_id} status to {status}")
-    
+        changes = {'status': status, 'last_modified': datetime.now()}
+        if error_message:
+            changes['error_message'] = error_message
+
+        with self._locked():
+            if not self._queue_update(doc_id, changes):
+                return
+        logger.debug("Updated document %s status to %s", doc_id, status)
+
     def update_extracted_info(self, doc_id: str, extracted_info: Dict[str, Any]):
         """Update extracted information for document"""
-        if doc_id in self.df.index:
-            # Use .at for setting complex data to avoid indexing issues
-            self.df.at[doc_id, 'extracted_info'] = extracted_info
-            self.df.at[doc_id, 'last_modified'] = datetime.now()
-            self._save_database()
-            logger.info(f"Updated extracted info for document {doc_id}")
-    
+        changes = {'extracted_info': extracted_info, 'last_modified': datetime.now()}
+
+        with self._locked():
+            if not self._queue_update(doc_id, changes):
+                return
+        logger.info("Updated extracted info for document %s", doc_id)
+
     def delete_document(self, doc_id: str) -> bool:
         """Delete document from database"""
-        if doc_id in self.df.index:
-            self.df.drop(doc_id, inplace=True)
-            self._save_database()
-            logger.info(f"Deleted document {doc_id}")
-            return True
-        return False
-    
-    def get_documents_by_status(self, status: str) -> List[Dict[str, Any]]:
+        with self._locked():
+            self._pending.pop(doc_id, None)
+            cursor = self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            if cursor.rowcount == 0:
+                return False
+            self._invalidate_cache(doc_id)
+        logger.info("Deleted document %s", doc_id)
+        return True
+
+    def get_documents_by_status(self, status: str) -> List[DocumentRow]:
         """Get documents filtered by status"""
-        filtered_df = self.df[self.df['status'] == status]
-        documents = []
-        for doc_id, row in filtered_df.iterrows():
-            doc_data = row.to_dict()
-            doc_data['id'] = doc_id
-            documents.append(doc_data)
-        return documents
-    
+        with self._locked():
+            documents = self._list_cache.get(status)
+            if documents is None:
+                self._flush_locked()
+                rows = self.conn.execute(
+                    f"{SELECT_DOCUMENTS} WHERE status = ? ORDER BY upload_date", (status,)
+                ).fetchall()
+                documents = list(map(self._row_to_document, rows))
+                self._list_cache[status] = documents
+        return list(documents)
+
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
-        total_docs = len(self.df)
-        status_counts = self.df['status'].value_counts().to_dict()
-        
+        with self._locked():
+            self._flush_locked()
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM documents GROUP BY status"
+            ).fetchall()
+        status_counts = {status: count for status, count in rows}
+
         return {
-            'total_documents': total_docs,
+            'total_documents': sum(status_counts.values()),
             'status_counts': status_counts,
-            'database_file': str(self.pickle_file),
+            'database_file': str(self.db_file),
             'last_backup': str(self.backup_file) if self.backup_file.exists() else None
         }
 
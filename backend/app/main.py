@@ -1,9 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import logging
 import os
-from pathlib import Path
 
 # Import API routers
 from .api.documents import router as documents_router
@@ -11,7 +10,8 @@ from .api.parsing import router as parsing_router
 from .api.extraction import router as extraction_router
 
 # Import database to ensure initialization
-from .database import db
+from .database import db, DatabaseBusyError, BACKEND_DIR
+from .services.ocr_service import shutdown_ocr_pool
 
 # Configure logging
 logging.basicConfig(
@@ -26,7 +26,8 @@ app = FastAPI(
     description="API for uploading PDF documents, performing OCR, and extracting structured information",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -58,23 +59,22 @@ async def startup_event():
     logger.info("Starting PDF OCR API server...")
     
     # Ensure required directories exist
-    backend_path = Path(__file__).parent.parent
     required_dirs = [
-        backend_path / "uploads",
-        backend_path / "outputs", 
-        backend_path / "database"
+        BACKEND_DIR / "uploads",
+        BACKEND_DIR / "outputs", 
+        BACKEND_DIR / "database"
     ]
     
     for dir_path in required_dirs:
         dir_path.mkdir(exist_ok=True)
-        logger.info(f"Ensured directory exists: {dir_path}")
+        logger.info("Ensured directory exists: %s", dir_path)
     
     # Initialize database
     try:
         stats = db.get_database_stats()
-        logger.info(f"Database initialized with {stats['total_documents']} documents")
+        logger.info("Database initialized with %s documents", stats['total_documents'])
     except Exception as e:
-        logger.error(f"Database initialization error: {e}")
+        logger.error("Database initialization error: %s", e)
     
     logger.info("API server startup complete")
 
@@ -82,6 +82,11 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info("Shutting down PDF OCR API server...")
+    
+    # Stop OCR workers, then write any coalesced database updates before exiting
+    shutdown_ocr_pool()
+    db.flush()
+    db.backup()
 
 @app.get("/")
 async def root():
@@ -106,8 +111,8 @@ async def health_check():
             "timestamp": "2024-01-01T00:00:00Z"  # You might want to use actual timestamp
         }
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        logger.error("Health check failed: %s", e)
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -116,11 +121,24 @@ async def health_check():
             }
         )
 
+@app.exception_handler(DatabaseBusyError)
+async def database_busy_handler(request, exc):
+    """Return a fast 503 when the database is saturated"""
+    logger.warning("Database busy: %s", exc)
+    return ORJSONResponse(
+        status_code=503,
+        content={
+            "error": "Service unavailable",
+            "message": "The database is busy, please retry shortly"
+        },
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+@dataclass(slots=True, frozen=True)
+class DocumentRow:
+    """
+    Document record as stored in the database.
+    """
+    id: str
+    original_filename: str
+    upload_date: Optional[datetime]
+    status: str
+    upload_path: Optional[str]
+    output_folder: Optional[str]
+    raw_copy_path: Optional[str]
+    html_path: Optional[str]
+    extracted_info_path: Optional[str]
+    metadata_path: Optional[str]
+    sha256: Optional[str] = None
+    extracted_info: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+    @property
+    def has_extracted_info(self) -> bool:
+        return self.extracted_info is not None
@@ -1,17 +1,39 @@
 import os
-from openai import OpenAI
+import asyncio
+import logging
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
 from dotenv import load_dotenv
 from app.models.schemas import ExtractedInformation
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Keep the OpenAI client's request logging out of INFO output
+logging.getLogger("openai").setLevel(logging.WARNING)
+
 api_key = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=api_key)
+# Retries are handled below, so the client's own retries would multiply them
+client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
+# Limit concurrent OpenAI calls and retry transient failures with exponential backoff
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+OPENAI_MAX_RETRIES = 3
+# Rate limits, network errors, timeouts and 5xx responses; APITimeoutError is an
+# APIConnectionError, but is listed for clarity
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+_openai_semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
 
 
-def extract_information_from_document(document: str) -> ExtractedInformation:
+async def extract_information_from_document(document: str) -> ExtractedInformation:
     system_prompt = """
     You are a medical administration assistant.
     Your task is to extract structured information from clinic referral documents, made by a physician to  a specialist.
@@ -32,12 +54,21 @@ def extract_information_from_document(document: str) -> ExtractedInformation:
     """
     user_prompt = document
 
-    response = client.responses.parse(
-        model="gpt-4o-2024-08-06",
-        instructions=system_prompt,
-        input=user_prompt,
-        text_format= ExtractedInformation
-    )
+    for attempt in range(OPENAI_MAX_RETRIES):
+        try:
+            async with _openai_semaphore:
+                response = await client.responses.parse(
+                    model="gpt-4o-2024-08-06",
+                    instructions=system_prompt,
+                    input=user_prompt,
+                    text_format= ExtractedInformation
+                )
+            break
+        except RETRYABLE_ERRORS:
+            if attempt == OPENAI_MAX_RETRIES - 1:
+                raise
+            # Back off without holding a slot, so other calls can proceed
+            await asyncio.sleep(min(60, 2 ** attempt))
 
-    print(response.output_parsed)
+    logger.debug("Extracted information: %s", response.output_parsed)
     return response.output_parsed
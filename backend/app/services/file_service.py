@@ -0,0 +1,57 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Union
+
+def link_or_copy(src_path: Union[str, Path], dst_path: Union[str, Path]) -> None:
+    """
+    Hardlink a file into place, copying in kernel space across filesystems
+
+    A hardlinked copy shares its inode with the source, so it must never be
+    modified in place - delete it and relink instead.
+
+    Args:
+        src_path: Path to the existing file
+        dst_path: Path of the new link or copy
+    """
+    Path(dst_path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src_path, dst_path)
+        return
+    except OSError:
+        pass
+
+    # Different filesystems: copy without going through user space, keeping timestamps
+    try:
+        _copy_in_kernel(src_path, dst_path)
+    except (AttributeError, OSError):
+        # No copy_file_range/sendfile to regular files here (Windows, macOS): plain copy
+        try:
+            shutil.copy2(src_path, dst_path)
+        except BaseException:
+            # Don't leave a partial copy behind
+            Path(dst_path).unlink(missing_ok=True)
+            raise
+
+def _copy_in_kernel(src_path: Union[str, Path], dst_path: Union[str, Path]) -> None:
+    """Copy a file with copy_file_range, falling back to sendfile, and keep its timestamps"""
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        src_stat = os.fstat(src.fileno())
+        offset = 0
+        try:
+            # copy_file_range can share extents on copy-on-write filesystems (btrfs, XFS)
+            while offset < src_stat.st_size:
+                copied = os.copy_file_range(
+                    src.fileno(), dst.fileno(), src_stat.st_size - offset, offset
+                )
+                if copied == 0:
+                    break
+                offset += copied
+        except (AttributeError, OSError):
+            # Not supported here; sendfile continues from where copy_file_range stopped
+            while offset < src_stat.st_size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, src_stat.st_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    os.utime(dst_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
\ No newline at end of file
@@ -0,0 +1,39 @@
+import re
+from typing import List
+
+# Marker renders each conversion as a complete HTML page
+BODY_OPEN = re.compile(r'<body\b[^>]*>', re.IGNORECASE)
+BODY_CLOSE = re.compile(r'</body\s*>', re.IGNORECASE)
+
+def _split_body(document: str):
+    """Split an HTML page into (text up to <body>, body contents, text from </body>)"""
+    opening = BODY_OPEN.search(document)
+    if not opening:
+        return "", document, ""
+    closing = None
+    for closing in BODY_CLOSE.finditer(document, opening.end()):
+        pass
+    end = closing.start() if closing else len(document)
+    return document[:opening.end()], document[opening.end():end], document[end:]
+
+def stitch_html_documents(documents: List[str]) -> str:
+    """
+    Merge HTML pages converted separately into one page
+    
+    The first page's head is kept and the bodies are joined in order, so page
+    chunks converted in parallel are saved as a single document.
+    
+    Args:
+        documents: Complete HTML pages, in page order
+        
+    Returns:
+        One HTML page containing every body
+    """
+    if not documents:
+        return ""
+    
+    head, first_body, tail = _split_body(documents[0])
+    bodies = [first_body]
+    bodies.extend(_split_body(document)[1] for document in documents[1:])
+    
+    return head + "".join(bodies) + tail
\ No newline at end of file
@@ -1,11 +1,22 @@
 import os
 import sys
+import asyncio
 import re
 import logging
 import threading
+import time
 import tempfile
+import codecs
+import multiprocessing
+import functools
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
+from tqdm import tqdm
+import pypdfium2 as pdfium
 
 # Marker library imports
 from marker.converters.pdf import PdfConverter
@@ -14,7 +25,8 @@ from marker.output import text_from_rendered
 from marker.config.parser import ConfigParser
 
 # Import progress manager
-from .progress_manager import progress_manager
+from .progress_manager import progress_manager, init_worker_progress
+from .html_service import stitch_html_documents
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +34,15 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Worker processes for OCR; the pool size bounds concurrent OCR jobs.
+# Every worker loads its own copy of the marker models, so memory grows with it.
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", "2"))
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_progress_queue = None
+
+# Larger PDFs are split into chunks of this many pages, converted in parallel
+OCR_PAGES_PER_CHUNK = int(os.getenv("OCR_PAGES_PER_CHUNK", "20"))
+
 # Configure marker
 openai_config = {
     'output_format': 'html',
@@ -40,90 +61,229 @@ azure_config = {
     'deployment_name': 'gpt-4o',
 }
 
-# Initialize marker components
-config_parser = ConfigParser(azure_config)
-artifact_dict = create_model_dict()
+@functools.cache
+def _get_artifact_dict() -> dict:
+    """Load the marker models on first use; every converter shares them"""
+    return create_model_dict()
+
+@functools.lru_cache(maxsize=4)
+def _make_converter(config_key: Tuple[Tuple[str, object], ...]) -> PdfConverter:
+    """Build a converter for one config, given as sorted (key, value) pairs"""
+    config_parser = ConfigParser(dict(config_key))
+    
+    return PdfConverter(
+        config=config_parser.generate_config_dict(),
+        artifact_dict=_get_artifact_dict(),
+        processor_list=config_parser.get_processors(),
+        renderer=config_parser.get_renderer(),
+        llm_service=config_parser.get_llm_service()
+    )
+
+def get_converter(config: dict = None) -> PdfConverter:
+    """
+    Get the converter for a marker config, building it on first use
+    
+    Args:
+        config: Marker config, defaults to azure_config
+        
+    Returns:
+        Converter shared by every caller using the same config
+    """
+    if config is None:
+        config = azure_config
+    return _make_converter(tuple(sorted(config.items())))
 
-converter = PdfConverter(
-    config=config_parser.generate_config_dict(),
-    artifact_dict=artifact_dict,
-    processor_list=config_parser.get_processors(),
-    renderer=config_parser.get_renderer(),
-    llm_service=config_parser.get_llm_service()
+# Flexible patterns to match various tqdm/marker progress bar formats, compiled once.
+# Each is paired with a substring it requires, checked before running the regex.
+# Negated character classes keep failing matches linear instead of backtracking.
+PROGRESS_PATTERNS = (
+    # Main pattern - handles both ASCII and Unicode progress bars with flexible spacing
+    ('|', re.compile(r'^([^:\n]+?):\s*(\d+)%\|[^|]*\|\s*(\d+/\d+)\s*\[[^\]]*\]')),
+    # Fallback pattern - more permissive, focuses on key elements
+    ('/', re.compile(r'^([^:\n]+?):\s*(\d+)%[^0-9]*(\d+/\d+)')),
+    # Minimal pattern - just task and percentage
+    ('%', re.compile(r'^([^:\n]+?):\s*(\d+)%'))
 )
 
+# Minimum seconds between repeated updates for the same task and percentage
+PROGRESS_UPDATE_INTERVAL = 0.25
+
+def split_tqdm_line(line: str) -> Optional[Tuple[str, int, str]]:
+    """
+    Parse a standard tqdm bar ("task: NN%|bar| n/total [stats]") without a regex
+    
+    Accepts exactly the lines the main progress pattern matches.
+    
+    Args:
+        line: Stripped output line
+        
+    Returns:
+        (task name, percentage, "n/total"), or None if the line has another shape
+    """
+    head, sep, rest = line.partition(':')
+    if not sep or not head:
+        return None
+    
+    percentage, sep, rest = rest.lstrip().partition('%')
+    if not sep or not percentage.isdecimal() or not rest.startswith('|'):
+        return None
+    
+    _, sep, rest = rest[1:].partition('|')
+    if not sep:
+        return None
+    
+    progress_info, sep, stats = rest.partition('[')
+    progress_info = progress_info.strip()
+    done, slash, total = progress_info.partition('/')
+    if (not sep or ']' not in stats or not slash
+            or not done.isdecimal() or not total.isdecimal()):
+        return None
+    
+    return head.strip(), int(percentage), progress_info
+
 class ProgressCapture:
     """Capture and parse marker progress output"""
     
-    def __init__(self, doc_id: str):
+    def __init__(self, doc_id: str, chunk: int = None):
         self.doc_id = doc_id
-        # Flexible patterns to match various tqdm/marker progress bar formats
-        self.progress_patterns = [
-            # Main pattern - handles both ASCII and Unicode progress bars with flexible spacing
-            re.compile(r'^(.+?):\s*(\d+)%\|[^|]*\|\s*(\d+/\d+)\s*\[.+\]'),
-            # Fallback pattern - more permissive, focuses on key elements
-            re.compile(r'^(.+?):\s*(\d+)%.*?(\d+/\d+)'),
-            # Minimal pattern - just task and percentage
-            re.compile(r'^(.+?):\s*(\d+)%')
-        ]
+        # Index of the page chunk being converted, whose progress is combined with the others
+        self.chunk = chunk
+        # (task, percentage, monotonic time) of the last forwarded update
+        self._last_update = (None, -1, 0.0)
+        # Set once tqdm reports directly, after which printed output is not parsed
+        self.structured = False
+    
+    def report(self, task_name: str, percentage: int, progress_info: str = None):
+        """Forward a progress update, skipping redraws of the same tick"""
+        now = time.monotonic()
+        last_task, last_percentage, last_time = self._last_update
+        if ((task_name, percentage) != (last_task, last_percentage)
+                or now - last_time >= PROGRESS_UPDATE_INTERVAL):
+            self._last_update = (task_name, percentage, now)
+            if self.chunk is not None:
+                progress_manager.update_chunk_progress(self.doc_id, self.chunk, percentage)
+                return
+            progress_manager.update_progress(
+                self.doc_id, 
+                task_name, 
+                percentage, 
+                progress_info
+            )
         
     def parse_progress_line(self, line: str):
         """Parse a single line for progress information with fallback patterns"""
+        if self.structured:
+            return None
+        
         line = line.strip()
-        if not line:
+        
+        # Every progress line has a percentage; skip other output without touching a regex
+        if not line or '%' not in line:
             return None
             
-        # Debug: log the line we're trying to parse
-        if '%|' in line or '%' in line:
-            logger.debug(f"Attempting to parse progress line: {line}")
+        # Debug: log the line we're trying to parse; checked first, as this runs per tqdm redraw
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Attempting to parse progress line: %s", line)
+        
+        # Standard tqdm bars are split with str.partition; regexes handle the rest
+        parsed = split_tqdm_line(line)
+        if parsed:
+            task_name, percentage, progress_info = parsed
+            if debug:
+                logger.debug("Successfully parsed tqdm bar: task='%s', percentage=%d, info='%s'",
+                             task_name, percentage, progress_info)
+        else:
+            # Try each pattern in order of specificity
+            for i, (required, pattern) in enumerate(PROGRESS_PATTERNS):
+                if required not in line:
+                    continue
+                match = pattern.match(line)
+                if match:
+                    task_name = match.group(1).strip()
+                    percentage = int(match.group(2))
+                    
+                    # Extract progress info if available (pattern dependent)
+                    progress_info = None
+                    if len(match.groups()) >= 3:
+                        progress_info = match.group(3)
+                    
+                    if debug:
+                        logger.debug("Successfully parsed with pattern %d: task='%s', percentage=%d, info='%s'",
+                                     i, task_name, percentage, progress_info)
+                    parsed = (task_name, percentage, progress_info)
+                    break
         
-        # Try each pattern in order of specificity
-        for i, pattern in enumerate(self.progress_patterns):
-            match = pattern.match(line)
-            if match:
-                task_name = match.group(1).strip()
-                percentage = int(match.group(2))
-                
-                # Extract progress info if available (pattern dependent)
-                progress_info = None
-                if len(match.groups()) >= 3:
-                    progress_info = match.group(3)
-                
-                logger.debug(f"Successfully parsed with pattern {i}: task='{task_name}', percentage={percentage}, info='{progress_info}'")
-                
-                # Update progress manager
-                progress_manager.update_progress(
-                    self.doc_id, 
-                    task_name, 
-                    percentage, 
-                    progress_info
-                )
-                
-                return {
-                    'task': task_name,
-                    'percentage': percentage,
-                    'progress': progress_info
-                }
+        if parsed:
+            # Update progress manager
+            self.report(task_name, percentage, progress_info)
+            
+            return {
+                'task': task_name,
+                'percentage': percentage,
+                'progress': progress_info
+            }
         
         # Log unmatched lines that look like progress for debugging
-        if '%' in line and any(char in line for char in ['|', '[', ']']):
-            logger.warning(f"Failed to parse potential progress line: {line}")
+        if any(char in line for char in ['|', '[', ']']):
+            logger.warning("Failed to parse potential progress line: %s", line)
         
         return None
 
+# Progress capture for the OCR job running on the current thread
+_ocr_context = threading.local()
+
+_tqdm_update = tqdm.update
+_tqdm_close = tqdm.close
+
+def _report_tqdm_progress(bar: tqdm):
+    """Report a tqdm bar's position to the current OCR job, if any"""
+    progress_capture = getattr(_ocr_context, 'progress_capture', None)
+    if progress_capture is not None and bar.total:
+        progress_capture.structured = True
+        progress_capture.report(
+            bar.desc or 'Processing',
+            int(100 * bar.n / bar.total),
+            f"{bar.n}/{bar.total}"
+        )
+
+def _report_tqdm_update(self, n=1):
+    """tqdm.update hook that reports progress directly instead of via printed bars"""
+    displayed = _tqdm_update(self, n)
+    _report_tqdm_progress(self)
+    return displayed
+
+def _report_tqdm_close(self):
+    """tqdm.close hook so the final position of iterated bars is reported"""
+    _report_tqdm_progress(self)
+    _tqdm_close(self)
+
+# marker drives its progress bars through tqdm, so hook the shared class
+tqdm.update = _report_tqdm_update
+tqdm.close = _report_tqdm_close
+
 class OutputCapture:
     """Capture stdout/stderr and extract progress information"""
     
-    def __init__(self, doc_id: str, original_stream):
-        self.progress_capture = ProgressCapture(doc_id)
+    def __init__(self, progress_capture: ProgressCapture, original_stream):
+        self.progress_capture = progress_capture
         self.original_stream = original_stream
+        # Trailing partial line carried over to the next write
+        self._buffer = ''
         
     def write(self, text: str):
-        # Parse each line for progress
-        lines = text.split('\n')
-        for line in lines:
-            if line.strip():
-                self.progress_capture.parse_progress_line(line)
+        # tqdm redraws its bar with carriage returns, so treat them as line breaks too
+        if '\n' in text or '\r' in text:
+            data = self._buffer + text
+            end = max(data.rfind('\n'), data.rfind('\r'))
+            self._buffer = data[end + 1:]
+            # Parse each complete line for progress
+            for line in data[:end].splitlines():
+                if line.strip():
+                    self.progress_capture.parse_progress_line(line)
+        else:
+            # No complete line yet; just carry the fragment over
+            self._buffer += text
         
         # Also write to original stream for logging
         self.original_stream.write(text)
@@ -131,129 +291,282 @@ class OutputCapture:
     def flush(self):
         self.original_stream.flush()
 
-def process_pdf_to_markdown_sync(pdf_path: str, output_path: str, doc_id: str = None) -> str:
+class _PipeReaderLogFilter(logging.Filter):
+    """
+    Divert the pipe reader's own log records to the capture file
+    
+    While fds 1 and 2 are redirected, a record logged by the reader would be
+    written back into the pipe it drains and parsed again, growing each round
+    until the reader blocks on its own pipe.
+    """
+    
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.thread_id = None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.thread != self.thread_id:
+            return True
+        self.stream.write(f"{record.levelname}:{record.name}:{record.getMessage()}\n")
+        return False
+
+@contextmanager
+def _redirect_fds(capture_file, progress_capture: ProgressCapture = None):
     """
-    Convert PDF to markdown using pre-loaded marker OCR models with progress tracking (synchronous)
-    This is the original function for cases where isolation isn't needed.
+    Route file descriptors 1 and 2 through a pipe read by a dedicated thread
+    
+    This also captures output from native code, but dup2 affects every thread
+    in the process, so it is only used in dedicated OCR worker processes.
+    """
+    output = OutputCapture(progress_capture, capture_file) if progress_capture else capture_file
+    sys.stdout.flush()
+    sys.stderr.flush()
+    
+    read_fd, write_fd = os.pipe()
+    saved_fds = (os.dup(1), os.dup(2))
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+    
+    log_filter = _PipeReaderLogFilter(capture_file)
+    
+    def pump():
+        log_filter.thread_id = threading.get_ident()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        try:
+            while chunk := os.read(read_fd, 65536):
+                output.write(decoder.decode(chunk))
+        finally:
+            os.close(read_fd)
+    
+    logger.addFilter(log_filter)
+    reader = threading.Thread(target=pump, name="ocr-output", daemon=True)
+    reader.start()
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Restoring both descriptors closes the pipe's last write end, ending the reader
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+        reader.join()
+        logger.removeFilter(log_filter)
+
+def write_html(output_path: str, text: str) -> None:
+    """Write converted HTML as bytes, encoding it up front"""
+    # write_bytes writes everything or raises, so a short write can't truncate the file
+    Path(output_path).write_bytes(text.encode('utf-8'))
+
+def _convert_pdf(pdf_path: str, progress_capture: ProgressCapture = None) -> str:
+    """Run the converter with output captured to a temporary file and return the HTML"""
+    with tempfile.NamedTemporaryFile(mode='w+', delete=True, suffix='.log') as capture_file:
+        with _redirect_fds(capture_file, progress_capture):
+            _ocr_context.progress_capture = progress_capture
+            try:
+                # Process PDF using the shared converter
+                rendered = get_converter()(pdf_path)
+            finally:
+                _ocr_context.progress_capture = None
+    
+    # Extract text from rendered result
+    text, _, images = text_from_rendered(rendered)
+    return text
+
+def process_pdf_to_markdown_blocking(pdf_path: str, output_path: str, doc_id: str = None) -> None:
+    """
+    Convert PDF to HTML with file-descriptor level output capture, blocking until done
+    
+    Only for dedicated worker processes, as the capture affects the whole process.
     
     Args:
         pdf_path: Path to input PDF file
-        output_path: Path where markdown file should be saved
+        output_path: Path where HTML file should be saved
         doc_id: Document ID for progress tracking (optional)
         
-    Returns:
-        Extracted markdown text
+    Raises:
+        Exception: If OCR fails; callers are responsible for recording the error status
     """
-    logger.info(f"Processing PDF: {pdf_path}")
+    logger.info("Processing PDF: %s", pdf_path)
     
-    # Set up progress tracking if doc_id provided
     if doc_id:
         progress_manager.set_status(doc_id, 'processing')
-        
-        # Capture progress during processing
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
-        
-        try:
-            stdout_capture = OutputCapture(doc_id, original_stdout)
-            stderr_capture = OutputCapture(doc_id, original_stderr)
-            sys.stdout = stdout_capture
-            sys.stderr = stderr_capture
-            
-            # Process PDF using pre-loaded converter
-            rendered = converter(pdf_path)
-            
-        finally:
-            # Restore original streams
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
-    else:
-        # Process without progress tracking
-        rendered = converter(pdf_path)
     
-    text, _, images = text_from_rendered(rendered)
+    progress_capture = ProgressCapture(doc_id) if doc_id else None
+    text = _convert_pdf(pdf_path, progress_capture)
     
-    # Save output html to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(text)
+    # Save output to file
+    write_html(output_path, text)
     
     if doc_id:
         progress_manager.set_status(doc_id, 'completed')
     
-    logger.info(f"PDF processed successfully, saved to: {output_path}")
+    logger.info("PDF processed successfully, saved to: %s", output_path)
+
+def process_pdf_in_worker(pdf_path: str, output_path: str, doc_id: str) -> None:
+    """Process pool entry point: convert a PDF with output captured at the file-descriptor level"""
+    process_pdf_to_markdown_blocking(pdf_path, output_path, doc_id)
+
+def convert_pdf_chunk_in_worker(pdf_path: str, doc_id: str, chunk: int) -> str:
+    """Process pool entry point: convert one page chunk of a larger PDF and return its HTML"""
+    return _convert_pdf(pdf_path, ProgressCapture(doc_id, chunk))
+
+def split_pdf(pdf_path: str, output_dir: str, pages_per_chunk: int) -> List[Tuple[str, int, int]]:
+    """
+    Split a PDF into files of consecutive pages
     
-    return text
+    Args:
+        pdf_path: Path to input PDF file
+        output_dir: Directory for the chunk files
+        pages_per_chunk: Maximum pages per chunk
+        
+    Returns:
+        List of (chunk path, first page, last page) with 1-based page numbers, in page order
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page_count = len(pdf)
+        chunks = []
+        for start in range(0, page_count, pages_per_chunk):
+            end = min(start + pages_per_chunk, page_count)
+            chunk = pdfium.PdfDocument.new()
+            try:
+                chunk.import_pages(pdf, list(range(start, end)))
+                chunk_path = os.path.join(output_dir, f"chunk_{len(chunks)}.pdf")
+                chunk.save(chunk_path)
+            finally:
+                chunk.close()
+            chunks.append((chunk_path, start + 1, end))
+        return chunks
+    finally:
+        pdf.close()
+
+def _count_pages(pdf_path: str) -> int:
+    """Get the number of pages in a PDF"""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+def _init_ocr_worker(progress_queue):
+    """
+    Process pool initializer: forward progress to the API process
+    
+    Also loads the marker models, once per worker, before it takes its first job.
+    """
+    init_worker_progress(progress_queue)
+    get_converter()
+    logger.info("OCR worker %s ready", os.getpid())
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Create the OCR process pool and its progress listener on first use"""
+    global _ocr_pool, _progress_queue
+    if _ocr_pool is None:
+        mp_context = multiprocessing.get_context("spawn")
+        if _progress_queue is None:
+            _progress_queue = mp_context.Queue()
+            threading.Thread(
+                target=progress_manager.listen,
+                args=(_progress_queue,),
+                name="ocr-progress",
+                daemon=True
+            ).start()
+        _ocr_pool = ProcessPoolExecutor(
+            max_workers=OCR_CONCURRENCY,
+            mp_context=mp_context,
+            initializer=_init_ocr_worker,
+            initargs=(_progress_queue,)
+        )
+    return _ocr_pool
 
-def process_pdf_to_markdown(pdf_path: str, output_path: str, doc_id: str = None, database=None) -> None:
+def submit_ocr_job(pdf_path: str, output_path: str, doc_id: str) -> Future:
     """
-    Convert PDF to markdown using background thread with file-based output capture
+    Queue a PDF conversion on the OCR worker pool
     
     Args:
         pdf_path: Path to input PDF file
-        output_path: Path where markdown file should be saved
-        doc_id: Document ID for progress tracking (optional)
-        database: Database instance for updating document status (optional)
+        output_path: Path where HTML file should be saved
+        doc_id: Document ID for progress tracking
+        
+    Returns:
+        Future that completes when the HTML file has been written
     """
-    logger.info(f"Starting threaded PDF processing: {pdf_path}")
+    return _submit(process_pdf_in_worker, pdf_path, output_path, doc_id)
+
+def _submit(fn, *args) -> Future:
+    """Submit a job to the OCR pool, replacing the pool if a worker has died"""
+    global _ocr_pool
+    try:
+        return _get_ocr_pool().submit(fn, *args)
+    except BrokenProcessPool:
+        # Release the broken pool's resources before starting a fresh one
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_pool = None
+        return _get_ocr_pool().submit(fn, *args)
+
+async def run_ocr_job(pdf_path: str, output_path: str, doc_id: str) -> None:
+    """
+    Convert a PDF on the worker pool, splitting large documents into page chunks
+    that are converted in parallel and stitched back together in page order
     
-    if doc_id:
-        progress_manager.set_status(doc_id, 'processing')
+    Args:
+        pdf_path: Path to input PDF file
+        output_path: Path where HTML file should be saved
+        doc_id: Document ID for progress tracking
+    """
+    page_count = await asyncio.to_thread(_count_pages, pdf_path)
+    if OCR_CONCURRENCY < 2 or page_count <= OCR_PAGES_PER_CHUNK:
+        await asyncio.wrap_future(submit_ocr_job(pdf_path, output_path, doc_id))
+        return
     
-    def run_ocr_thread():
-        """Run OCR processing in background thread with isolated output capture"""
+    logger.info(
+        "Processing PDF in chunks of %s pages: %s (%s pages)", OCR_PAGES_PER_CHUNK, pdf_path, page_count
+    )
+    progress_manager.set_status(doc_id, 'processing')
+    
+    with tempfile.TemporaryDirectory(prefix=f"ocr-{doc_id}-") as chunk_dir:
+        chunks = await asyncio.to_thread(split_pdf, pdf_path, chunk_dir, OCR_PAGES_PER_CHUNK)
+        # Workers report each chunk's progress; the API process combines it, weighted by pages
+        progress_manager.start_chunks(doc_id, [last - first + 1 for _, first, last in chunks])
+        futures = [
+            _submit(convert_pdf_chunk_in_worker, chunk_path, doc_id, chunk)
+            for chunk, (chunk_path, _, _) in enumerate(chunks)
+        ]
+        
+        async def convert_chunk(future: Future, chunk: int) -> str:
+            html = await asyncio.wrap_future(future)
+            progress_manager.finish_chunk(doc_id, chunk)
+            return html
+        
         try:
-            # Create temporary file to capture stdout/stderr
-            with tempfile.NamedTemporaryFile(mode='w+', delete=True, suffix='.log') as capture_file:
-                # Store original streams
-                original_stdout = sys.stdout
-                original_stderr = sys.stderr
-                
-                try:
-                    # Set up progress capture that writes to temp file
-                    if doc_id:
-                        stdout_capture = OutputCapture(doc_id, capture_file)
-                        stderr_capture = OutputCapture(doc_id, capture_file)
-                        sys.stdout = stdout_capture
-                        sys.stderr = stderr_capture
-                    else:
-                        # If no doc_id, just redirect to temp file to avoid FastAPI interference
-                        sys.stdout = capture_file
-                        sys.stderr = capture_file
-                    
-                    # Process PDF using pre-loaded converter
-                    rendered = converter(pdf_path)
-                    
-                finally:
-                    # Always restore original streams
-                    sys.stdout = original_stdout
-                    sys.stderr = original_stderr
-                
-                # Extract text from rendered result
-                text, _, images = text_from_rendered(rendered)
-                
-                # Save output to file
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                
-                if doc_id:
-                    progress_manager.set_status(doc_id, 'completed')
-                    # Update database status if database instance provided
-                    if database:
-                        database.update_document_status(doc_id, 'parsed')
-                
-                logger.info(f"PDF processed successfully, saved to: {output_path}")
-                
-        except Exception as e:
-            error_msg = f"OCR processing failed: {str(e)}"
-            logger.error(error_msg)
-            if doc_id:
-                progress_manager.set_status(doc_id, 'error', error_msg)
-                # Update database status if database instance provided
-                if database:
-                    database.update_document_status(doc_id, 'error', error_msg)
-    
-    # Run in background thread to avoid blocking FastAPI
-    ocr_thread = threading.Thread(target=run_ocr_thread, daemon=True)
-    ocr_thread.start()
-    
-    logger.info(f"OCR processing started in background thread for doc_id: {doc_id}")
\ No newline at end of file
+            parts = await asyncio.gather(*(
+                convert_chunk(future, chunk) for chunk, future in enumerate(futures)
+            ))
+        except BaseException:
+            # Drop queued chunks, and let running ones finish before their files are removed
+            for future in futures:
+                future.cancel()
+            await asyncio.to_thread(wait, futures)
+            raise
+        finally:
+            progress_manager.end_chunks(doc_id)
+    
+    # Each chunk is a complete HTML page; keep one head and join the bodies
+    await asyncio.to_thread(write_html, output_path, stitch_html_documents(parts))
+    progress_manager.set_status(doc_id, 'completed')
+    logger.info("PDF processed successfully, saved to: %s", output_path)
+
+def shutdown_ocr_pool():
+    """Stop the OCR worker processes and the progress listener"""
+    global _ocr_pool, _progress_queue
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_pool = None
+    if _progress_queue is not None:
+        _progress_queue.put(None)
+        _progress_queue = None
\ No newline at end of file
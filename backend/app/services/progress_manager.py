@@ -1,11 +1,30 @@
 import logging
-from typing import Dict, Any, Optional
+from collections import OrderedDict, namedtuple
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import threading
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Progress is kept for this many of the most recently updated documents
+MAX_TRACKED_DOCUMENTS = 1024
+
+# A document's progress; entries are immutable and replaced whole on every update
+Progress = namedtuple(
+    'Progress',
+    'task percentage progress_info last_updated_ts status error_message',
+    defaults=(None, 0, None, None, None, None)
+)
+EMPTY_PROGRESS = Progress()
+
+# Statuses that end a job; late updates from its workers must not reopen it
+FINISHED_STATUSES = ('completed', 'error')
+
+# A chunk restarts at 0% for every marker stage, so a running chunk never counts as done
+CHUNK_RUNNING_CAP = 99
+
 class ProgressManager:
     """Simple in-memory progress tracking for document processing"""
     
@@ -24,61 +43,157 @@ class ProgressManager:
         if self._initialized:
             return
             
-        self.progress_data: Dict[str, Dict[str, Any]] = {}
-        self.data_lock = threading.Lock()
+        # Ordered from least to most recently updated, so the oldest entries are evicted first
+        self.progress_data: "OrderedDict[str, Progress]" = OrderedDict()
+        # Writers lock per document; readers take the current entry without locking
+        self._doc_locks: Dict[str, threading.Lock] = {}
+        # Guards adding, reordering and removing entries, and iterating over them
+        self._order_lock = threading.Lock()
+        # Documents converted in page chunks, combined into one overall percentage
+        self._chunk_jobs: Dict[str, Dict[str, Any]] = {}
+        self._chunk_lock = threading.Lock()
+        # Set in OCR worker processes to send updates back to the API process
+        self.forward_queue = None
         self._initialized = True
         logger.info("ProgressManager initialized")
     
+    def _doc_lock(self, doc_id: str) -> threading.Lock:
+        """Get the write lock for a document, creating it atomically on first use"""
+        lock = self._doc_locks.get(doc_id)
+        if lock is None:
+            lock = self._doc_locks.setdefault(doc_id, threading.Lock())
+        return lock
+    
+    def _store(self, doc_id: str, progress: Progress):
+        """Replace a document's progress entry, marking it most recently updated"""
+        with self._order_lock:
+            self.progress_data[doc_id] = progress
+            self.progress_data.move_to_end(doc_id)
+            while len(self.progress_data) > MAX_TRACKED_DOCUMENTS:
+                evicted_id, _ = self.progress_data.popitem(last=False)
+                self._doc_locks.pop(evicted_id, None)
+    
     def update_progress(self, doc_id: str, task: str, percentage: int, progress_info: str = None):
         """Update progress for a document"""
-        with self.data_lock:
-            if doc_id not in self.progress_data:
-                self.progress_data[doc_id] = {}
-            
-            self.progress_data[doc_id].update({
-                'task': task,
-                'percentage': percentage,
-                'progress_info': progress_info,
-                'last_updated': datetime.now().isoformat(),
-                'status': 'processing'
-            })
+        if self.forward_queue is not None:
+            self.forward_queue.put(('update_progress', (doc_id, task, percentage, progress_info)))
+            return
+        
+        with self._doc_lock(doc_id):
+            progress = self.progress_data.get(doc_id, EMPTY_PROGRESS)
+            if progress.status in FINISHED_STATUSES:
+                return
+            self._store(doc_id, progress._replace(
+                task=task,
+                percentage=percentage,
+                progress_info=progress_info,
+                last_updated_ts=time.time(),
+                status='processing'
+            ))
             
-        logger.info(f"Updated progress for {doc_id}: {task} {percentage}%")
+        logger.debug("Updated progress for %s: %s %s%%", doc_id, task, percentage)
     
     def get_progress(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get current progress for a document"""
-        with self.data_lock:
-            return self.progress_data.get(doc_id)
+        progress = self.progress_data.get(doc_id)
+        return self._snapshot(progress) if progress is not None else None
+    
+    @staticmethod
+    def _snapshot(progress: Progress) -> Dict[str, Any]:
+        """Convert a progress entry to a dict, formatting its timestamp only when it is read"""
+        snapshot = progress._asdict()
+        timestamp = snapshot.pop('last_updated_ts')
+        snapshot['last_updated'] = datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+        return snapshot
     
     def set_status(self, doc_id: str, status: str, error_message: str = None):
         """Set processing status for a document"""
-        with self.data_lock:
-            if doc_id not in self.progress_data:
-                self.progress_data[doc_id] = {}
-            
-            self.progress_data[doc_id].update({
-                'status': status,
-                'last_updated': datetime.now().isoformat()
-            })
-            
-            if error_message:
-                self.progress_data[doc_id]['error_message'] = error_message
-            elif 'error_message' in self.progress_data[doc_id]:
-                del self.progress_data[doc_id]['error_message']
+        if self.forward_queue is not None:
+            self.forward_queue.put(('set_status', (doc_id, status, error_message)))
+            return
+        
+        with self._doc_lock(doc_id):
+            progress = self.progress_data.get(doc_id, EMPTY_PROGRESS)
+            self._store(doc_id, progress._replace(
+                status=status,
+                last_updated_ts=time.time(),
+                error_message=error_message or None
+            ))
                 
-        logger.info(f"Set status for {doc_id}: {status}")
+        logger.debug("Set status for %s: %s", doc_id, status)
+    
+    def start_chunks(self, doc_id: str, page_counts: List[int]):
+        """Start combining progress for a document converted in chunks of the given page counts"""
+        with self._chunk_lock:
+            self._chunk_jobs[doc_id] = {
+                'pages': list(page_counts),
+                'percentages': [0] * len(page_counts),
+                'overall': 0
+            }
+    
+    def update_chunk_progress(self, doc_id: str, chunk: int, percentage: int):
+        """Record a chunk's progress and publish the document's overall percentage"""
+        if self.forward_queue is not None:
+            self.forward_queue.put(('update_chunk_progress', (doc_id, chunk, percentage)))
+            return
+        
+        with self._chunk_lock:
+            job = self._chunk_jobs.get(doc_id)
+            if job is None:
+                return
+            # Keep each chunk's highest value, short of done until its result arrives
+            percentages = job['percentages']
+            percentages[chunk] = max(percentages[chunk], min(percentage, CHUNK_RUNNING_CAP))
+            self._publish_chunks(doc_id, job)
+    
+    def finish_chunk(self, doc_id: str, chunk: int):
+        """Mark a chunk as converted and publish the document's overall percentage"""
+        with self._chunk_lock:
+            job = self._chunk_jobs.get(doc_id)
+            if job is None:
+                return
+            job['percentages'][chunk] = 100
+            self._publish_chunks(doc_id, job)
+    
+    def end_chunks(self, doc_id: str):
+        """Stop combining chunk progress for a document; late chunk updates are dropped"""
+        with self._chunk_lock:
+            self._chunk_jobs.pop(doc_id, None)
+    
+    def _publish_chunks(self, doc_id: str, job: Dict[str, Any]):
+        """Publish the page-weighted average of the chunk percentages, never moving backwards"""
+        pages = job['pages']
+        total_pages = sum(pages)
+        weighted = sum(percentage * count for percentage, count in zip(job['percentages'], pages))
+        job['overall'] = max(job['overall'], weighted // total_pages)
+        pages_done = sum(count for percentage, count in zip(job['percentages'], pages) if percentage == 100)
+        # Published under the chunk lock so concurrent updates can't arrive out of order
+        self.update_progress(doc_id, "Converting pages", job['overall'], f"{pages_done}/{total_pages}")
     
     def clear_progress(self, doc_id: str):
         """Clear progress data for a document"""
-        with self.data_lock:
-            if doc_id in self.progress_data:
-                del self.progress_data[doc_id]
-        logger.debug(f"Cleared progress for {doc_id}")
+        with self._doc_lock(doc_id), self._order_lock:
+            self.progress_data.pop(doc_id, None)
+        self._doc_locks.pop(doc_id, None)
+        logger.debug("Cleared progress for %s", doc_id)
+    
+    def listen(self, queue):
+        """Apply updates forwarded from worker processes until None is received"""
+        for method, args in iter(queue.get, None):
+            try:
+                getattr(self, method)(*args)
+            except Exception as e:
+                logger.error("Error applying forwarded progress update: %s", e)
     
     def get_all_progress(self) -> Dict[str, Dict[str, Any]]:
         """Get progress data for all documents (for debugging)"""
-        with self.data_lock:
-            return self.progress_data.copy()
+        with self._order_lock:
+            items = list(self.progress_data.items())
+        return {doc_id: self._snapshot(progress) for doc_id, progress in items}
 
 # Global progress manager instance
-progress_manager = ProgressManager()
\ No newline at end of file
+progress_manager = ProgressManager()
+
+def init_worker_progress(queue):
+    """Process pool initializer: forward this worker's progress updates through the queue"""
+    progress_manager.forward_queue = queue
\ No newline at end of file
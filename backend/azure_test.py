@@ -12,9 +12,9 @@ client = AzureOpenAI(
     api_version='2024-10-21',
 )
 
-# Read and encode the image
+# Read and encode the image; base64 output is pure ASCII, so decode it as such
 with open("sample.jpg", "rb") as image_file:
-    image_data = base64.b64encode(image_file.read()).decode('utf-8')
+    image_url = "data:image/jpeg;base64," + base64.b64encode(image_file.read()).decode('ascii')
 
 response = client.chat.completions.create(
     messages=[
@@ -32,7 +32,7 @@ response = client.chat.completions.create(
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/jpeg;base64,{image_data}"
+                        "url": image_url
                     }
                 }
             ]
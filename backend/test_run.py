@@ -33,28 +33,32 @@ azure_config = {
     'deployment_name': 'gpt-4o',
 }
 
-config_parser = ConfigParser(azure_config)
-artifact_dict = create_model_dict()
-
-converter = PdfConverter(
-    config=config_parser.generate_config_dict(),
-    artifact_dict=artifact_dict,
-    processor_list=config_parser.get_processors(),
-    renderer=config_parser.get_renderer(),
-    llm_service=config_parser.get_llm_service()
-)
+def main():
+    config_parser = ConfigParser(azure_config)
+    artifact_dict = create_model_dict()
+
+    converter = PdfConverter(
+        config=config_parser.generate_config_dict(),
+        artifact_dict=artifact_dict,
+        processor_list=config_parser.get_processors(),
+        renderer=config_parser.get_renderer(),
+        llm_service=config_parser.get_llm_service()
+    )
     
-rendered = converter('tmp/sample2.pdf')
+    rendered = converter('tmp/sample2.pdf')
+
+    print(rendered)
+    llm_tokens_used = sum(page['block_metadata']['llm_tokens_used'] for page in rendered.metadata['page_stats'])
+    print(f"LLM tokens used: {llm_tokens_used}")
 
-print(rendered)
-llm_tokens_used = sum(page['block_metadata']['llm_tokens_used'] for page in rendered.metadata['page_stats'])
-print(f"LLM tokens used: {llm_tokens_used}")
+    print("Processing complete!")
+    text, _, images = text_from_rendered(rendered)
 
-print("Processing complete!")
-text, _, images = text_from_rendered(rendered)
+    # save the text as an HTML file
+    with open('tmp/sample_parsed.html', 'w') as f:
+        f.write(text)
 
-# save the text as an HTML file
-with open('tmp/sample_parsed.html', 'w') as f:
-    f.write(text)
+    print('done')
 
-print('done')
+if __name__ == '__main__':
+    main()
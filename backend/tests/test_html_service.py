@@ -0,0 +1,60 @@
+import unittest
+
+from app.services.html_service import stitch_html_documents
+
+# Shaped like marker's html renderer output (see tmp/sample_parsed.html)
+FIRST_CHUNK = """<!DOCTYPE html>
+<html>
+ <head>
+  <meta charset="utf-8"/>
+ </head>
+ <body>
+  <h2>
+   Ellis Park Medical
+  </h2>
+  <p block-type="Text">
+   Patient: KIMBALL, JOSEPH
+  </p>
+ </body>
+</html>
+"""
+
+SECOND_CHUNK = """<!DOCTYPE html>
+<html>
+ <head>
+  <meta charset="utf-8"/>
+ </head>
+ <body>
+  <p block-type="Text">
+   Requesting Physician: Dr. Desk, Front
+  </p>
+ </body>
+</html>
+"""
+
+class StitchHtmlDocumentsTest(unittest.TestCase):
+    def test_joins_bodies_under_one_head(self):
+        html = stitch_html_documents([FIRST_CHUNK, SECOND_CHUNK])
+        
+        self.assertEqual(html.count("<!DOCTYPE html>"), 1)
+        self.assertEqual(html.count("<head>"), 1)
+        self.assertEqual(html.count("<body>"), 1)
+        self.assertEqual(html.count("</body>"), 1)
+        self.assertTrue(html.startswith("<!DOCTYPE html>"))
+        self.assertTrue(html.rstrip().endswith("</html>"))
+        
+        body = html[html.index("<body>"):html.index("</body>")]
+        self.assertLess(body.index("Ellis Park Medical"), body.index("KIMBALL, JOSEPH"))
+        self.assertLess(body.index("KIMBALL, JOSEPH"), body.index("Requesting Physician"))
+    
+    def test_single_document_is_unchanged(self):
+        self.assertEqual(stitch_html_documents([FIRST_CHUNK]), FIRST_CHUNK)
+    
+    def test_fragments_without_body_are_appended(self):
+        html = stitch_html_documents([FIRST_CHUNK, "<p>extra</p>"])
+        
+        self.assertEqual(html.count("</body>"), 1)
+        self.assertLess(html.index("<p>extra</p>"), html.index("</body>"))
+
+if __name__ == '__main__':
+    unittest.main()
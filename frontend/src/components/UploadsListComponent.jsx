@@ -42,6 +42,7 @@ const UploadsListComponent = ({
   const fileInputRef = useRef(null);
   const [isUploading, setIsUploading] = useState(false);
   const [uploadError, setUploadError] = useState(null);
+  const [uploadNotice, setUploadNotice] = useState(null);
   const [progressData, setProgressData] = useState({});
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [documentToDelete, setDocumentToDelete] = useState(null);
@@ -54,6 +55,7 @@ const UploadsListComponent = ({
     
     setIsUploading(true);
     setUploadError(null);
+    setUploadNotice(null);
     
     try {
       // Call API to upload files
@@ -64,10 +66,17 @@ const UploadsListComponent = ({
         setUploadError(`Some files failed to upload: ${response.errors.map(e => e.error).join(', ')}`);
       }
       
-      // If successful uploads, notify parent component
-      if (response.uploaded_documents && response.uploaded_documents.length > 0) {
+      // Files whose content was already uploaded point at the existing document
+      const duplicates = response.duplicates || [];
+      if (duplicates.length > 0) {
+        setUploadNotice(`Already uploaded: ${duplicates.map(d => `${d.uploaded_as} (as ${d.filename})`).join(', ')}`);
+      }
+      
+      // If successful uploads or duplicates, notify parent component
+      const documentsToShow = [...(response.uploaded_documents || []), ...duplicates];
+      if (documentsToShow.length > 0) {
         // Transform API response to match frontend format
-        const uploadedDocs = response.uploaded_documents.map(doc => ({
+        const uploadedDocs = documentsToShow.map(doc => ({
           id: doc.id,
           filename: doc.filename,
           status: doc.status,
@@ -222,6 +231,12 @@ const UploadsListComponent = ({
             </Alert>
           )}
           
+          {uploadNotice && (
+            <Alert severity="info" sx={{ mt: 1 }}>
+              {uploadNotice}
+            </Alert>
+          )}
+          
           {unparsedCount > 0 && (
             <Button
               variant="contained"
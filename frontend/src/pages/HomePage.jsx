@@ -58,8 +58,14 @@ const HomePage = () => {
   };
 
   const handleDocumentUpload = (uploadedDocuments) => {
-    // Add uploaded documents to the state
-    setDocuments(prev => [...prev, ...uploadedDocuments]);
+    // Add uploaded documents to the state; duplicates of listed documents are already there
+    setDocuments(prev => {
+      const listedIds = new Set(prev.map(doc => doc.id));
+      const newDocuments = uploadedDocuments.filter(doc => !listedIds.has(doc.id));
+      return [...prev, ...newDocuments.filter((doc, index) => 
+        newDocuments.findIndex(other => other.id === doc.id) === index
+      )];
+    });
     
     // Auto-select the first uploaded document if none selected
     if (!selectedDocumentId && uploadedDocuments.length > 0) {
@@ -125,19 +131,18 @@ const HomePage = () => {
           : doc
       ));
 
-      // Call backend to parse all documents
+      // Call backend to start parsing all documents; it returns once OCR has started
       const response = await parsingService.parseMultipleDocuments(docIds);
       
-      // Update document statuses based on batch response
+      // Update document statuses based on batch response. Started documents stay
+      // 'parsing' until progress polling reports them completed or failed.
       setDocuments(prev => prev.map(doc => {
         if (!docIds.includes(doc.id)) return doc;
         
-        // Check if this document was processed successfully
-        const wasProcessed = response.processed?.some(p => p.doc_id === doc.id);
         const wasFailed = response.failed?.some(f => f.doc_id === doc.id);
         const wasAlreadyParsed = response.already_parsed?.includes(doc.id);
         
-        if (wasProcessed || wasAlreadyParsed) {
+        if (wasAlreadyParsed) {
           return { ...doc, status: 'parsed' };
         } else if (wasFailed) {
           const failedDoc = response.failed.find(f => f.doc_id === doc.id);
@@ -151,7 +156,7 @@ const HomePage = () => {
         return doc;
       }));
 
-      console.log('Batch parse completed:', response);
+      console.log('Batch parse started:', response);
       
     } catch (error) {
       console.error('Batch parse failed:', error);